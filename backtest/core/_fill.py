@@ -0,0 +1,46 @@
+"""Gap filling for strategy preprocessing.
+
+``ffill_bfill(df)`` matches ``df.ffill().bfill()`` but only touches columns
+that actually contain missing values; float columns are filled in a single
+array pass.
+"""
+
+import numpy as np
+
+try:
+    from ._njit import njit
+except ImportError:
+    # Loaded as a top-level module with backtest/core on sys.path
+    from _njit import njit
+
+
+@njit(nogil=True)
+def ffill_bfill_1d(values):
+    """Forward-fill NaN, then back-fill any leading NaN from the first valid value."""
+    out = values.copy()
+    last = np.nan
+    first_valid = -1
+    for i in range(len(out)):
+        if np.isnan(out[i]):
+            out[i] = last
+        else:
+            last = out[i]
+            if first_valid < 0:
+                first_valid = i
+    if first_valid > 0:
+        out[:first_valid] = values[first_valid]
+    return out
+
+
+def ffill_bfill(df):
+    """Equivalent of df.ffill().bfill() that skips columns without gaps."""
+    out = df.copy(deep=False)
+    for col in df.columns:
+        series = df[col]
+        if not series.hasnans:
+            continue
+        if series.dtype.kind == 'f':
+            out[col] = ffill_bfill_1d(series.to_numpy())
+        else:
+            out[col] = series.ffill().bfill()
+    return out
@@ -0,0 +1,20 @@
+"""Optional Numba support for the backtesting kernels.
+
+Exposes ``njit`` and ``NUMBA_AVAILABLE``. When Numba is not installed,
+``njit`` is a no-op decorator so kernels still run as plain Python.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -0,0 +1,235 @@
+"""Streaming rolling-window kernels shared by the engine and example strategies.
+
+Each kernel makes one O(N) pass over a float64 array and matches the
+corresponding pandas rolling call, including NaN handling.
+"""
+
+import numpy as np
+
+try:
+    from ._njit import njit
+except ImportError:
+    # Loaded as a top-level module with backtest/core on sys.path
+    from _njit import njit
+
+
+@njit(nogil=True)
+def rolling_mean(values, window):
+    """Series.rolling(window).mean(): running Kahan-compensated sum, NaN until
+    the window holds `window` valid values."""
+    n = len(values)
+    out = np.empty(n)
+    total = 0.0
+    comp = 0.0
+    count = 0
+    for i in range(n):
+        x = values[i]
+        if not np.isnan(x):
+            y = x - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+            count += 1
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+                count -= 1
+        if count == 0:
+            total = 0.0
+            comp = 0.0
+        out[i] = total / count if count >= window else np.nan
+    return out
+
+
+@njit(nogil=True)
+def _var_add(x, count, mean, ssqdm, comp):
+    """Compensated Welford update adding x to the window state."""
+    count += 1
+    prev_mean = mean - comp
+    y = x - comp
+    t = y - mean
+    comp = t + mean - y
+    mean += t / count
+    ssqdm += (x - prev_mean) * (x - mean)
+    return count, mean, ssqdm, comp
+
+
+@njit(nogil=True)
+def _var_remove(x, count, mean, ssqdm, comp):
+    """Compensated Welford update removing x from the window state."""
+    count -= 1
+    if count:
+        prev_mean = mean - comp
+        y = x - comp
+        t = y - mean
+        comp = t + mean - y
+        mean -= t / count
+        ssqdm -= (x - prev_mean) * (x - mean)
+    else:
+        mean = 0.0
+        ssqdm = 0.0
+    return count, mean, ssqdm, comp
+
+
+@njit(nogil=True)
+def _window_std(count, ssqdm, same_run):
+    """Sample std (ddof=1) of the window state; 0 when every value is identical."""
+    if count == 1:
+        return np.nan
+    if same_run >= count:
+        return 0.0
+    return np.sqrt(max(ssqdm, 0.0) / (count - 1))
+
+
+@njit(nogil=True)
+def rolling_mean_std(values, window):
+    """Series.rolling(window).mean() and .std() (ddof=1) in one pass.
+
+    Compensated Welford add/remove updates as in pandas' rolling var kernel;
+    NaN until the window holds `window` valid values.
+    """
+    n = len(values)
+    mean_out = np.empty(n)
+    std_out = np.empty(n)
+    mean = 0.0
+    ssqdm = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    count = 0
+    same_run = 0
+    prev_value = values[0] if n else np.nan
+    for i in range(n):
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                count, mean, ssqdm, comp_remove = _var_remove(old, count, mean, ssqdm, comp_remove)
+        x = values[i]
+        if not np.isnan(x):
+            # Length of the run of identical values ending here: an all-equal window has std 0
+            if x == prev_value:
+                same_run += 1
+            else:
+                same_run = 1
+            prev_value = x
+            count, mean, ssqdm, comp_add = _var_add(x, count, mean, ssqdm, comp_add)
+        if count >= window and count > 0:
+            mean_out[i] = mean
+            std_out[i] = _window_std(count, ssqdm, same_run)
+        else:
+            mean_out[i] = np.nan
+            std_out[i] = np.nan
+    return mean_out, std_out
+
+
+@njit(nogil=True)
+def rolling_zscore(values, window):
+    """Deviation from the rolling mean, scaled by the rolling std of that deviation.
+
+    One pass computing s = values.rolling(window).mean(), d = values - s and
+    z = d / d.rolling(window).std(); returns (s, d, z).
+    """
+    n = len(values)
+    sma = np.empty(n)
+    dev = np.empty(n)
+    z = np.empty(n)
+    # Kahan running sum for the mean (as rolling_mean)
+    total = 0.0
+    comp = 0.0
+    count = 0
+    # Welford state for the deviation window (as rolling_mean_std)
+    d_count = 0
+    d_mean = 0.0
+    d_ssqdm = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_run = 0
+    prev_dev = np.nan
+    for i in range(n):
+        x = values[i]
+        if not np.isnan(x):
+            y = x - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+            count += 1
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+                count -= 1
+        if count == 0:
+            total = 0.0
+            comp = 0.0
+        sma[i] = total / count if count >= window else np.nan
+        dev[i] = x - sma[i]
+
+        if i >= window:
+            old = dev[i - window]
+            if not np.isnan(old):
+                d_count, d_mean, d_ssqdm, comp_remove = _var_remove(old, d_count, d_mean, d_ssqdm, comp_remove)
+        d = dev[i]
+        if not np.isnan(d):
+            if d == prev_dev:
+                same_run += 1
+            else:
+                same_run = 1
+            prev_dev = d
+            d_count, d_mean, d_ssqdm, comp_add = _var_add(d, d_count, d_mean, d_ssqdm, comp_add)
+        if d_count >= window and d_count > 0:
+            sd = _window_std(d_count, d_ssqdm, same_run)
+        else:
+            sd = np.nan
+        # d / sd with NumPy semantics for a zero std
+        if sd == 0.0:
+            z[i] = np.nan if d == 0.0 else (np.inf if d > 0.0 else -np.inf)
+        else:
+            z[i] = d / sd
+    return sma, dev, z
+
+
+@njit(nogil=True)
+def _rolling_extreme(values, window, use_max, min_periods):
+    """Monotonic index deque over the last `window` bars, skipping NaN."""
+    n = len(values)
+    out = np.empty(n)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    count = 0
+    for i in range(n):
+        while head < tail and dq[head] <= i - window:
+            head += 1
+        if i >= window and not np.isnan(values[i - window]):
+            count -= 1
+        x = values[i]
+        if not np.isnan(x):
+            count += 1
+            if use_max:
+                while head < tail and values[dq[tail - 1]] <= x:
+                    tail -= 1
+            else:
+                while head < tail and values[dq[tail - 1]] >= x:
+                    tail -= 1
+            dq[tail] = i
+            tail += 1
+        out[i] = values[dq[head]] if head < tail and count >= min_periods else np.nan
+    return out
+
+
+@njit(nogil=True)
+def rolling_max(values, window, min_periods=1):
+    """Series.rolling(window, min_periods=min_periods).max()"""
+    return _rolling_extreme(values, window, True, min_periods)
+
+
+@njit(nogil=True)
+def rolling_min(values, window, min_periods=1):
+    """Series.rolling(window, min_periods=min_periods).min()"""
+    return _rolling_extreme(values, window, False, min_periods)
@@ -9,30 +9,423 @@ import os
 import sys
 import importlib
 import json
+import hashlib
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 import warnings
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 try:
     from tqdm import tqdm
     TQDM_AVAILABLE = True
 except ImportError:
     TQDM_AVAILABLE = False
     tqdm = lambda x, **kwargs: x
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+try:
+    from ._njit import njit, NUMBA_AVAILABLE
+    from ._rolling import rolling_mean, rolling_max, rolling_min
+except ImportError:
+    # Loaded as a top-level module with backtest/core on sys.path
+    from _njit import njit, NUMBA_AVAILABLE
+    from _rolling import rolling_mean, rolling_max, rolling_min
 warnings.filterwarnings('ignore')
 
+# pandas 3 always copies on write, so a shallow copy is safe to hand to a
+# strategy: mutating it only materializes the columns it touches. Older versions
+# need a real copy to keep the caller's frame untouched. The global option is not
+# switched on here, since that would change copy semantics for the whole process.
+_SHALLOW_COPY_SAFE = int(pd.__version__.split('.')[0]) >= 3
+
+# Column renames applied by BacktestEngine._normalize_columns
+_LOWER_MAP = {
+    'Date': 'date', 'Datetime': 'date',
+    'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume',
+    'StockName': 'symbol', 'Symbol': 'symbol'
+}
+_LOWER_KEYS = frozenset(_LOWER_MAP)
+_CAPS_MAP = {
+    'date': 'Datetime',
+    'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume',
+    'symbol': 'StockName'
+}
+_CAPS_KEYS = frozenset(_CAPS_MAP)
+
+
+def _shift_array(a, k):
+    """Positional equivalent of Series.shift(k) on a 1-D ndarray (NaN/NaT padded)."""
+    if k == 0:
+        return a.copy()
+    if a.dtype.kind in 'iub':
+        a = a.astype(np.float64)
+    fill = np.datetime64('NaT') if a.dtype.kind in 'mM' else np.nan
+    out = np.empty_like(a)
+    n = len(a)
+    if k >= n or -k >= n:
+        out[:] = fill
+    elif k > 0:
+        out[:k] = fill
+        out[k:] = a[:-k]
+    else:
+        out[k:] = fill
+        out[:k] = a[-k:]
+    return out
+
+
+@njit(nogil=True)
+def _metrics_kernel(signals, strategy_returns):
+    """Single-pass signal metrics over int8/float64 signals and float64 strategy returns.
+
+    Mirrors the NumPy path of calculate_performance_metrics: NaN strategy
+    returns (the first bar, NaN signals) are skipped like pandas reductions.
+
+    Returns:
+        tuple: (total_signals, win_rate, total_return, max_drawdown, sharpe_ratio,
+                cagr, annualized_volatility, avg_trade_duration, buy_signals, sell_signals)
+    """
+    trading_days = 252
+    ann_factor = np.sqrt(trading_days)
+
+    total_signals = 0.0
+    buy_ct = 0
+    sell_ct = 0
+    winning = 0
+    total_return = 0.0
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    cum = 1.0
+    run_max = np.nan
+    max_dd = np.nan
+    dur_sum = 0.0
+    dur_ct = 0
+    in_trade = False
+    trade_start = 0
+
+    for i in range(len(signals)):
+        s = signals[i]
+        if not np.isnan(s):
+            total_signals += abs(s)
+        if s == 1:
+            buy_ct += 1
+            if not in_trade:  # Enter trade
+                in_trade = True
+                trade_start = i
+        elif s == -1:
+            sell_ct += 1
+            if in_trade:  # Exit trade
+                dur_sum += i - trade_start
+                dur_ct += 1
+                in_trade = False
+
+    for i in range(len(strategy_returns)):
+        r = strategy_returns[i]
+        if np.isnan(r):
+            continue
+
+        # Sum, win count and Welford mean/variance
+        total_return += r
+        if r > 0:
+            winning += 1
+        count += 1
+        delta = r - mean
+        mean += delta / count
+        m2 += delta * (r - mean)
+
+        # Compounded equity, running peak and drawdown
+        cum *= 1.0 + r
+        if np.isnan(run_max) or cum > run_max:
+            run_max = cum
+        dd = (cum - run_max) / run_max
+        if np.isnan(max_dd) or dd < max_dd:
+            max_dd = dd
+
+    total_signals = int(total_signals)
+    win_rate = winning / total_signals if total_signals > 0 else 0.0
+    std = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+    sharpe = 0.0
+    ann_vol = 0.0
+    if std > 0:
+        sharpe = (mean * trading_days) / (std * ann_factor)
+        ann_vol = std * ann_factor
+    years = max(max(len(strategy_returns), 1) / trading_days, 1e-9)
+    cagr = cum ** (1 / years) - 1
+    avg_dur = dur_sum / dur_ct if dur_ct > 0 else 0.0
+
+    return (total_signals, win_rate, total_return, max_dd, sharpe,
+            cagr, ann_vol, avg_dur, buy_ct, sell_ct)
+
+
+@njit(nogil=True)
+def _simulate_kernel(entry_sig, exit_sig, entry_px, exit_px, target_size, close, has_close, initial_capital):
+    """Long-only, single-position portfolio walk over aligned float64 arrays.
+
+    Per bar: mark to market at the close, then enter on a positive entry signal
+    or exit on a non-zero exit signal at the supplied execution prices.
+
+    Returns:
+        tuple: (cash, shares, equity) per bar, then the transaction log as
+               (tx_bar, tx_side, tx_values, n_tx) where tx_side is 1=BUY/-1=SELL and
+               tx_values columns are price, quantity, amount, cash_before, cash_after,
+               shares_before, shares_after, equity_before, equity_after, pnl, return_pct
+    """
+    n = len(close)
+    cash_arr = np.empty(n)
+    shares_arr = np.empty(n, dtype=np.int64)
+    equity_arr = np.empty(n)
+    tx_bar = np.empty(n, dtype=np.int64)
+    tx_side = np.empty(n, dtype=np.int8)
+    tx_values = np.full((n, 11), np.nan)
+    n_tx = 0
+
+    cash = initial_capital
+    shares = 0
+    in_position = False
+    entry_price = 0.0
+
+    for i in range(n):
+        price_today_close = close[i]
+        mark = price_today_close if not np.isnan(price_today_close) else 0.0
+        cash_arr[i] = cash
+        shares_arr[i] = shares
+        equity_arr[i] = cash + shares * mark
+
+        if entry_sig[i] > 0 and not in_position:
+            px = entry_px[i]
+            if np.isnan(px) or px <= 0:
+                continue
+            size = target_size[i]
+            if not size > 0:
+                continue
+            intended_shares = int(np.floor(min(size, 1e18)))
+            if intended_shares <= 0:
+                continue
+            affordable_shares = int(np.floor(cash / px))
+            qty = max(min(intended_shares, affordable_shares), 0)
+            if qty <= 0:
+                continue
+            cost = qty * px
+            cash_before = cash
+            shares_before = shares
+            cash -= cost
+            shares += qty
+            in_position = True
+            entry_price = round(px, 6)
+            tx_px = price_today_close if has_close else px
+            tx_bar[n_tx] = i
+            tx_side[n_tx] = 1
+            tx_values[n_tx, 0] = px
+            tx_values[n_tx, 1] = qty
+            tx_values[n_tx, 2] = cost
+            tx_values[n_tx, 3] = cash_before
+            tx_values[n_tx, 4] = cash
+            tx_values[n_tx, 5] = shares_before
+            tx_values[n_tx, 6] = shares
+            tx_values[n_tx, 7] = cash_before + shares_before * tx_px
+            tx_values[n_tx, 8] = cash + shares * tx_px
+            n_tx += 1
+        elif exit_sig[i] != 0 and in_position and shares > 0:
+            px = exit_px[i]
+            if np.isnan(px):
+                continue
+            proceeds = shares * px
+            pnl = proceeds - shares * entry_price
+            return_pct = (round(px, 6) / entry_price - 1.0) * 100.0
+            cash_before = cash
+            shares_before = shares
+            cash += proceeds
+            shares = 0
+            in_position = False
+            tx_px = price_today_close if has_close else px
+            tx_bar[n_tx] = i
+            tx_side[n_tx] = -1
+            tx_values[n_tx, 0] = px
+            tx_values[n_tx, 1] = shares_before
+            tx_values[n_tx, 2] = proceeds
+            tx_values[n_tx, 3] = cash_before
+            tx_values[n_tx, 4] = cash
+            tx_values[n_tx, 5] = shares_before
+            tx_values[n_tx, 6] = shares
+            tx_values[n_tx, 7] = cash_before + shares_before * tx_px
+            tx_values[n_tx, 8] = cash + shares * tx_px
+            tx_values[n_tx, 9] = pnl
+            tx_values[n_tx, 10] = return_pct
+            n_tx += 1
+
+    return cash_arr, shares_arr, equity_arr, tx_bar, tx_side, tx_values, n_tx
+
+
+@njit
+def _ewm_update(weighted, old_wt, x, alpha):
+    """One step of pandas' ewm(adjust=False, ignore_na=False).mean() recursion."""
+    if not np.isnan(weighted):
+        old_wt *= 1.0 - alpha
+        if not np.isnan(x):
+            if weighted != x:
+                weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+            old_wt = 1.0
+    elif not np.isnan(x):
+        weighted = x
+    return weighted, old_wt
+
+
+@njit(nogil=True)
+def _features_kernel(close, high, low, volume):
+    """Fused indicator pass for BacktestEngine._enrich_features.
+
+    Returns:
+        tuple: (ema20, ema50, macd_hist, rsi, vol_ratio, high_52w, swing_low_10d, swing_high_10d)
+    """
+    n = len(close)
+    ema20 = np.empty(n)
+    ema50 = np.empty(n)
+    macd_hist = np.empty(n)
+    rsi = np.empty(n)
+
+    e20 = e50 = e12 = e26 = sig = up = down = np.nan
+    w20 = w50 = w12 = w26 = wsig = wup = wdown = 1.0
+    for i in range(n):
+        x = close[i]
+        e20, w20 = _ewm_update(e20, w20, x, 2.0 / 21.0)
+        e50, w50 = _ewm_update(e50, w50, x, 2.0 / 51.0)
+        e12, w12 = _ewm_update(e12, w12, x, 2.0 / 13.0)
+        e26, w26 = _ewm_update(e26, w26, x, 2.0 / 27.0)
+        macd = e12 - e26
+        sig, wsig = _ewm_update(sig, wsig, macd, 0.2)
+        ema20[i] = e20
+        ema50[i] = e50
+        macd_hist[i] = macd - sig
+
+        # RSI 14 on Wilder-smoothed gains/losses (first bar has no delta)
+        delta = x - close[i - 1] if i > 0 else np.nan
+        gain = max(delta, 0.0) if not np.isnan(delta) else np.nan
+        loss = -min(delta, 0.0) if not np.isnan(delta) else np.nan
+        up, wup = _ewm_update(up, wup, gain, 1.0 / 14.0)
+        down, wdown = _ewm_update(down, wdown, loss, 1.0 / 14.0)
+        rsi[i] = 100.0 - 100.0 / (1.0 + up / (down if down != 0 else 1e-12))
+
+    # Volume ratio to the full 10-bar mean
+    vol_mean = rolling_mean(volume, 10)
+    vol_ratio = volume / np.where(vol_mean == 0, 1e-12, vol_mean)
+
+    return (ema20, ema50, macd_hist, rsi, vol_ratio,
+            rolling_max(close, 252),
+            rolling_min(low, 10),
+            rolling_max(high, 10))
+
+
+def _features_vectorized(close, high, low, volume):
+    """pandas/Bottleneck counterpart of _features_kernel for runs without Numba."""
+    c = pd.Series(close)
+    ema20 = c.ewm(span=20, adjust=False).mean()
+    ema50 = c.ewm(span=50, adjust=False).mean()
+    macd = c.ewm(span=12, adjust=False).mean() - c.ewm(span=26, adjust=False).mean()
+    macd_hist = macd - macd.ewm(span=9, adjust=False).mean()
+    delta = c.diff()
+    roll_up = delta.clip(lower=0).ewm(alpha=1/14, adjust=False).mean()
+    roll_down = (-delta.clip(upper=0)).ewm(alpha=1/14, adjust=False).mean()
+    rsi = 100 - (100 / (1 + roll_up / roll_down.replace(0, 1e-12)))
+    if BOTTLENECK_AVAILABLE and len(close) >= 252:
+        # O(N) moving-window kernels in C (Bottleneck needs window <= length)
+        vol_mean = bn.move_mean(volume, window=10)
+        high_52w = bn.move_max(close, window=252, min_count=1)
+        swing_low = bn.move_min(low, window=10, min_count=1)
+        swing_high = bn.move_max(high, window=10, min_count=1)
+    else:
+        vol_mean = pd.Series(volume).rolling(10).mean().to_numpy()
+        high_52w = c.rolling(252, min_periods=1).max().to_numpy()
+        swing_low = pd.Series(low).rolling(10, min_periods=1).min().to_numpy()
+        swing_high = pd.Series(high).rolling(10, min_periods=1).max().to_numpy()
+    vol_ratio = volume / np.where(vol_mean == 0, 1e-12, vol_mean)
+    return (ema20.to_numpy(), ema50.to_numpy(), macd_hist.to_numpy(), rsi.to_numpy(),
+            vol_ratio, high_52w, swing_low, swing_high)
+
+
+@dataclass(frozen=True)
+class RuleConfig:
+    """Entry/exit signals (aligned float64 arrays) and execution price settings."""
+    entry_signals: np.ndarray
+    exit_signals: np.ndarray
+    entry_price_col: str
+    entry_shift: int
+    exit_price_col: str
+    exit_shift: int
+
+
+def _copy_hook_result(result):
+    """Independent copy of a hook output (Series/frame, ndarray, or dict of them) for the hook memo."""
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.copy(deep=not _SHALLOW_COPY_SAFE)
+    if isinstance(result, np.ndarray):
+        return result.copy()
+    if isinstance(result, dict):
+        return {k: _copy_hook_result(v) for k, v in result.items()}
+    return result
+
+
 class BacktestEngine:
     """
     Backtesting engine specifically designed for strat2.py format strategies
     """
     
-    def __init__(self, initial_capital=100000):
+    # Entries kept by the entry_rules/exit_rules/position_sizing memo
+    HOOK_CACHE_SIZE = 128
+
+    def __init__(self, initial_capital=100000, use_numba=True, cache_hooks=False):
         self.initial_capital = initial_capital
+        # Compiled kernels when Numba is installed; use_numba=False runs them as plain Python
+        self.use_numba = use_numba and NUMBA_AVAILABLE
+        # Memoize strategy hooks on (class, params, data) for repeated runs (see _call_hook)
+        self.cache_hooks = cache_hooks
+        self._hook_cache = OrderedDict()
         self.results = {}
+        # Synthetic datasets keyed by generator arguments (generation is deterministic)
+        self._test_data_cache = {}
+        # Resolved sizing hooks per strategy instance (see _resolve_sizing)
+        self._sizing_cache = {}
+        # Column-normalization variant that preprocess accepted, per (strategy class, input columns)
+        self._preprocess_variants = {}
+        # Guards the hook, sizing and preprocess caches when _run_backtests falls back to threads
+        self._cache_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Caches hold weakrefs and are per-process; workers start with empty ones
+        state = self.__dict__.copy()
+        state['_test_data_cache'] = {}
+        state['_sizing_cache'] = {}
+        state['_preprocess_variants'] = {}
+        state['_hook_cache'] = OrderedDict()
+        del state['_cache_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self):
+        """Drop cached synthetic data, resolved sizing hooks and memoized hook outputs."""
+        self._test_data_cache.clear()
+        with self._cache_lock:
+            self._sizing_cache.clear()
+            self._preprocess_variants.clear()
+            self._hook_cache.clear()
         
     def generate_test_data(self, days=500, start_price=100, trend='uptrend', volatility=0.02, symbol='TEST'):
         """Generate synthetic test data with various patterns"""
-        np.random.seed(42)  # For reproducible results
+        cache_key = ('test', days, start_price, trend, volatility, symbol)
+        if cache_key in self._test_data_cache:
+            return self._test_data_cache[cache_key].copy(deep=not _SHALLOW_COPY_SAFE)
+
+        rng = np.random.default_rng(42)  # For reproducible results
         
         dates = pd.date_range(start='2023-01-01', periods=days, freq='D')
         
@@ -51,7 +444,7 @@ class BacktestEngine:
         cycle2 = 0.05 * np.sin(2 * np.pi * np.arange(days) / 20)  # 20-day cycle
         
         # Generate random noise
-        noise = np.random.normal(0, volatility, days)
+        noise = rng.normal(0, volatility, days)
         
         # Combine all components
         log_returns = trend_component/days + cycle1/days + cycle2/days + noise
@@ -60,51 +453,64 @@ class BacktestEngine:
         prices = start_price * np.exp(np.cumsum(log_returns))
         
         # Generate OHLCV data
+        open_ = prices * (1 + rng.normal(0, 0.005, days))
+        high = prices * (1 + np.abs(rng.normal(0, 0.01, days)))
+        low = prices * (1 - np.abs(rng.normal(0, 0.01, days)))
+        volume = rng.integers(100000, 1000000, days)
+        
+        # Ensure high >= max(open, close) and low <= min(open, close), in place
+        np.maximum(high, open_, out=high)
+        np.maximum(high, prices, out=high)
+        np.minimum(low, open_, out=low)
+        np.minimum(low, prices, out=low)
+        
         data = pd.DataFrame({
             'date': dates,
             'symbol': symbol,
-            'open': prices * (1 + np.random.normal(0, 0.005, days)),
-            'high': prices * (1 + np.abs(np.random.normal(0, 0.01, days))),
-            'low': prices * (1 - np.abs(np.random.normal(0, 0.01, days))),
+            'open': open_,
+            'high': high,
+            'low': low,
             'close': prices,
-            'volume': np.random.randint(100000, 1000000, days)
+            'volume': volume
         })
         
-        # Ensure high >= max(open, close) and low <= min(open, close)
-        data['high'] = np.maximum(data['high'], np.maximum(data['open'], data['close']))
-        data['low'] = np.minimum(data['low'], np.minimum(data['open'], data['close']))
-        
-        return data
+        self._test_data_cache[cache_key] = data
+        return data.copy(deep=not _SHALLOW_COPY_SAFE)
     
     def generate_pairs_data(self, days=500):
         """Generate synthetic pairs data for pairs trading strategy"""
-        np.random.seed(42)
+        cache_key = ('pairs', days)
+        if cache_key in self._test_data_cache:
+            return self._test_data_cache[cache_key].copy(deep=not _SHALLOW_COPY_SAFE)
+
+        rng = np.random.default_rng(42)
         
         dates = pd.date_range(start='2023-01-01', periods=days, freq='D')
         
         # Create two correlated but mean-reverting series
         base_trend = np.linspace(0, 0.2, days)
-        common_factor = np.random.normal(0, 0.02, days)
+        common_factor = rng.normal(0, 0.02, days)
         
         # Stock A
-        stock_a_trend = base_trend + 0.3 * common_factor + np.random.normal(0, 0.015, days)
+        stock_a_trend = base_trend + 0.3 * common_factor + rng.normal(0, 0.015, days)
         stock_a_prices = 100 * np.exp(np.cumsum(stock_a_trend))
         
         # Stock B (correlated but with some divergence)
-        stock_b_trend = base_trend + 0.7 * common_factor + np.random.normal(0, 0.012, days)
+        stock_b_trend = base_trend + 0.7 * common_factor + rng.normal(0, 0.012, days)
         stock_b_prices = 95 * np.exp(np.cumsum(stock_b_trend))
         
         data = pd.DataFrame({
             'date': dates,
             'stock_a_close': stock_a_prices,
             'stock_b_close': stock_b_prices,
-            'stock_a_volume': np.random.randint(50000, 500000, days),
-            'stock_b_volume': np.random.randint(40000, 400000, days)
+            'stock_a_volume': rng.integers(50000, 500000, days),
+            'stock_b_volume': rng.integers(40000, 400000, days)
         })
         
-        return data
+        self._test_data_cache[cache_key] = data
+        return data.copy(deep=not _SHALLOW_COPY_SAFE)
     
-    def run_backtest(self, strategy_class, strategy_name, data, params=None, save_outputs=None):
+    def run_backtest(self, strategy_class, strategy_name, data, params=None, save_outputs=None, return_format=None):
         """
         Run backtest on a single strategy
         
@@ -113,6 +519,12 @@ class BacktestEngine:
             strategy_name: Name of the strategy
             data: Test data
             params: Strategy parameters
+            save_outputs: Optional dict with 'output_dir', 'symbol' and 'write'
+                (set of output keys: signals, prepared, enriched, paired_trades,
+                trades, equity, transactions, summary, metrics; default all)
+            return_format: 'arrow' to also return the portfolio equity curve,
+                sized trades and transactions as pyarrow RecordBatches under
+                'equity_curve', 'trades' and 'transactions'
             
         Returns:
             dict: Backtest results
@@ -126,31 +538,42 @@ class BacktestEngine:
             strategy = strategy_class(params)
             print(f"✅ Strategy initialized successfully")
 
-            # Attempt preprocessing with robust column normalization
+            # Attempt preprocessing with robust column normalization:
+            # as-is, then lowercase, then capitalized ('Datetime','Open',...).
+            # A variant that leaves the columns unchanged repeats an earlier
+            # attempt and is skipped; the variant that worked for this strategy
+            # class and input schema is tried first on later runs.
             processed_data = None
             preprocess_errors = []
+            schema_key = (strategy_class, tuple(data.columns))
+            variants = [None, "lower", "capitalized"]
+            with self._cache_lock:
+                known_variant = self._preprocess_variants.get(schema_key, None)
+            if known_variant in variants:
+                variants.remove(known_variant)
+                variants.insert(0, known_variant)
 
-            # 1) Try as-is
-            try:
-                processed_data = strategy.preprocess_data(data.copy())
-            except Exception as e1:
-                preprocess_errors.append(e1)
-            
-            # 2) Try lowercase-normalized schema
-            if processed_data is None:
-                try:
-                    normalized_lower = self._normalize_columns(data.copy(), variant="lower")
-                    processed_data = strategy.preprocess_data(normalized_lower)
-                except Exception as e2:
-                    preprocess_errors.append(e2)
-
-            # 3) Try capitalized-normalized schema (for strategies expecting 'Datetime','Open',...)
-            if processed_data is None:
+            tried_schemas = set()
+            for variant in variants:
+                if variant is None:
+                    candidate = data.copy(deep=not _SHALLOW_COPY_SAFE)
+                else:
+                    candidate = self._normalize_columns(data, variant=variant)
+                    if candidate is data:
+                        candidate = data.copy(deep=not _SHALLOW_COPY_SAFE)
+                schema = tuple(candidate.columns)
+                if schema in tried_schemas:
+                    continue
+                tried_schemas.add(schema)
                 try:
-                    normalized_caps = self._normalize_columns(data.copy(), variant="capitalized")
-                    processed_data = strategy.preprocess_data(normalized_caps)
-                except Exception as e3:
-                    preprocess_errors.append(e3)
+                    processed_data = strategy.preprocess_data(candidate)
+                except Exception as e:
+                    preprocess_errors.append(e)
+                    continue
+                if processed_data is not None:
+                    with self._cache_lock:
+                        self._preprocess_variants[schema_key] = variant
+                    break
 
             if processed_data is None:
                 raise RuntimeError(f"Preprocess failed under all normalization attempts: {[str(e) for e in preprocess_errors][:2]} ...")
@@ -164,7 +587,7 @@ class BacktestEngine:
             except Exception as e4:
                 # As a fallback, if the strategy still relies on a different naming, try alternate normalization once more
                 try:
-                    alt_processed = self._normalize_columns(processed_data.copy(), variant="lower")
+                    alt_processed = self._normalize_columns(processed_data, variant="lower")
                     signals_df = strategy.generate_signals(alt_processed)
                     processed_data = alt_processed
                 except Exception:
@@ -181,55 +604,58 @@ class BacktestEngine:
                     return {'status': 'FAILED', 'error': 'No Signal column generated'}
 
             signals = signals_df['Signal']
+            # Discrete {-1, 0, 1} signals fit in one byte; keep fractional/NaN signals as-is
+            if signals.dtype != np.int8 and signals.isin((-1, 0, 1)).all():
+                signals = signals.astype(np.int8)
             print(f"✅ Signal generation completed. Shape: {signals_df.shape}")
 
             # Calculate performance metrics (signal-based)
             results = self.calculate_performance_metrics(signals, processed_data)
 
             # Optionally persist outputs (signals, prepared data, metrics)
+            portfolio_frames = None
             if save_outputs and isinstance(save_outputs, dict):
                 try:
                     out_dir = save_outputs.get('output_dir')
                     symbol = save_outputs.get('symbol')
+                    # Optional subset of outputs to write (None = all). Sweeps can pass
+                    # e.g. {'summary'} to skip the per-run CSV/parquet exports.
+                    write = save_outputs.get('write')
+                    wants = lambda key: write is None or key in write
                     if out_dir:
                         Path(out_dir).mkdir(parents=True, exist_ok=True)
-                        # Save signals - keep ALL columns from signals_df (including SMA indicators, etc.)
-                        if 'date' in signals_df.columns:
-                            sig_df = signals_df.copy()
-                        else:
-                            # Fallback if no date column in signals_df
-                            sig_df = pd.DataFrame({'date': processed_data.get('date', pd.RangeIndex(len(signals))), 'Signal': signals}).reset_index(drop=True)
-                        sig_path = Path(out_dir) / 'signals.parquet'
-                        sig_df.to_parquet(sig_path, index=False)
-                        # Also save CSVs for easy viewing
-                        (Path(out_dir) / 'signals_full.csv').write_text(sig_df.to_csv(index=False))
-                        nonzero = sig_df[sig_df['Signal'] != 0]
-                        (Path(out_dir) / 'signals_nonzero.csv').write_text(nonzero.to_csv(index=False))
+                        sig_df, prep = self._output_frames(signals_df, processed_data, signals)
+                        if wants('signals'):
+                            sig_path = Path(out_dir) / 'signals.parquet'
+                            sig_df.to_parquet(sig_path, index=False, engine='pyarrow', compression='snappy')
+                            # Also save CSVs for easy viewing (streamed to disk by the C writer)
+                            sig_df.to_csv(Path(out_dir) / 'signals_full.csv', index=False)
+                            nonzero = sig_df.iloc[sig_df['Signal'].to_numpy() != 0]
+                            nonzero.to_csv(Path(out_dir) / 'signals_nonzero.csv', index=False)
                         # Save prepared data (raw OHLCV only, no MBVC enrichment)
-                        data_cols = [c for c in ['date','symbol','open','high','low','close','volume'] if c in processed_data.columns]
-                        prep = processed_data[data_cols].copy()
-                        prep_path = Path(out_dir) / 'prepared_data.parquet'
-                        prep.to_parquet(prep_path, index=False)
+                        if wants('prepared'):
+                            prep_path = Path(out_dir) / 'prepared_data.parquet'
+                            prep.to_parquet(prep_path, index=False, engine='pyarrow', compression='snappy')
 
                         # Create enriched CSV with JUST the strategy's own indicators
                         # Merge signals_df (which contains strategy's own columns like SMA_short, SMA_long)
                         # with prepared data
-                        enriched_with_signal = pd.merge(prep, sig_df, on='date', how='left', suffixes=('', '_y'))
-                        
-                        # Event-only export for convenience (only non-zero signals)
-                        events_only = enriched_with_signal[enriched_with_signal['Signal'] != 0].copy()
-                        
-                        # Remove duplicate columns from merge (keep only non-suffixed version)
-                        events_only = events_only[[c for c in events_only.columns if not c.endswith('_y')]]
-                        
-                        enr_path = Path(out_dir) / 'signals_enriched.csv'
-                        events_only.to_csv(enr_path, index=False)
-                        
-                        # Generate paired trades (one row per complete buy/sell trade)
-                        paired_trades = self._pair_signals_into_trades(enriched_with_signal)
-                        if len(paired_trades) > 0:
-                            paired_path = Path(out_dir) / 'paired_trades.csv'
-                            paired_trades.to_csv(paired_path, index=False)
+                        if wants('enriched') or wants('paired_trades'):
+                            enriched_with_signal = self._align_signals(prep, sig_df)
+
+                        if wants('enriched'):
+                            # Event-only export for convenience (only non-zero signals)
+                            events_only = enriched_with_signal.iloc[enriched_with_signal['Signal'].to_numpy() != 0]
+
+                            enr_path = Path(out_dir) / 'signals_enriched.csv'
+                            events_only.to_csv(enr_path, index=False)
+
+                        if wants('paired_trades'):
+                            # Generate paired trades (one row per complete buy/sell trade)
+                            paired_trades = self._pair_signals_into_trades(enriched_with_signal)
+                            if len(paired_trades) > 0:
+                                paired_path = Path(out_dir) / 'paired_trades.csv'
+                                paired_trades.to_csv(paired_path, index=False)
 
                         # Portfolio simulation with sizing (next-bar execution)
                         try:
@@ -239,14 +665,17 @@ class BacktestEngine:
                                 strategy=strategy,
                                 initial_capital=self.initial_capital
                             )
+                            portfolio_frames = (trades_with_size, portfolio_transactions_df, equity_curve)
 
                             # Save sized trades and equity curve
-                            (Path(out_dir) / 'trades_with_size.csv').write_text(trades_with_size.to_csv(index=False))
-                            equity_curve_path = Path(out_dir) / 'equity_curve.parquet'
-                            equity_curve.to_parquet(equity_curve_path, index=False)
+                            if wants('trades'):
+                                trades_with_size.to_csv(Path(out_dir) / 'trades_with_size.csv', index=False)
+                            if wants('equity'):
+                                equity_curve_path = Path(out_dir) / 'equity_curve.parquet'
+                                equity_curve.to_parquet(equity_curve_path, index=False, engine='pyarrow', compression='snappy')
                             
                             # Save detailed portfolio transactions
-                            if len(portfolio_transactions_df) > 0:
+                            if wants('transactions') and len(portfolio_transactions_df) > 0:
                                 trans_path = Path(out_dir) / 'portfolio_transactions.csv'
                                 portfolio_transactions_df.to_csv(trans_path, index=False)
                             
@@ -268,9 +697,10 @@ class BacktestEngine:
                                 'losing_trades': len(trades_with_size[trades_with_size['pnl'] < 0]) if len(trades_with_size) > 0 and 'pnl' in trades_with_size.columns else 0
                             }
                             
-                            summary_path = Path(out_dir) / 'portfolio_summary.json'
-                            with open(summary_path, 'w') as f:
-                                json.dump(portfolio_summary, f, indent=2)
+                            if wants('summary'):
+                                summary_path = Path(out_dir) / 'portfolio_summary.json'
+                                with open(summary_path, 'w') as f:
+                                    json.dump(portfolio_summary, f, indent=2)
 
                             # Merge portfolio metrics into results (prefixed)
                             for k, v in portfolio_metrics.items():
@@ -280,15 +710,33 @@ class BacktestEngine:
                             print(traceback.format_exc())
                         
                         # Save metrics
-                        met_path = Path(out_dir) / 'metrics.json'
-                        # Convert numpy types to native
-                        serializable = {k: (float(v) if hasattr(v, 'item') else v) for k,v in results.items() if k not in ('strategy_description','parameter_schema')}
-                        with open(met_path, 'w') as f:
-                            json.dump({**serializable, 'strategy_name': strategy_name, 'symbol': symbol}, f, indent=2)
+                        if wants('metrics'):
+                            met_path = Path(out_dir) / 'metrics.json'
+                            # Convert numpy types to native
+                            serializable = {k: (float(v) if hasattr(v, 'item') else v) for k,v in results.items() if k not in ('strategy_description','parameter_schema')}
+                            with open(met_path, 'w') as f:
+                                json.dump({**serializable, 'strategy_name': strategy_name, 'symbol': symbol}, f, indent=2)
                 except Exception as _:
                     # Do not fail run on save errors
                     pass
 
+            if return_format == 'arrow':
+                import pyarrow as pa
+                if portfolio_frames is None:
+                    sig_df, prep = self._output_frames(signals_df, processed_data, signals)
+                    *portfolio_frames, portfolio_metrics = self._simulate_portfolio_with_sizing(
+                        prepared_df=prep,
+                        signals_df=sig_df,
+                        strategy=strategy,
+                        initial_capital=self.initial_capital
+                    )
+                    for k, v in portfolio_metrics.items():
+                        results[f'portfolio_{k}'] = v
+                trades_with_size, portfolio_transactions_df, equity_curve = portfolio_frames
+                results['equity_curve'] = pa.RecordBatch.from_pandas(equity_curve, preserve_index=False)
+                results['trades'] = pa.RecordBatch.from_pandas(trades_with_size, preserve_index=False)
+                results['transactions'] = pa.RecordBatch.from_pandas(portfolio_transactions_df, preserve_index=False)
+
             # Add strategy-specific information
             results['strategy_name'] = strategy_name
             results['strategy_description'] = strategy.description()
@@ -316,8 +764,16 @@ class BacktestEngine:
     
     def calculate_performance_metrics(self, signals, data):
         """Calculate comprehensive performance metrics"""
+        sig_arr = signals.to_numpy() if signals.dtype == np.int8 else signals.to_numpy(dtype=np.float64)
+        signal_counts = None
+        if sig_arr.dtype == np.int8:
+            # Discrete signals: one pass counts SELL (-1), flat (0) and BUY (1) bars
+            signal_counts = np.bincount((sig_arr + 1).view(np.uint8), minlength=3)
+            nonzero_signals = int(signal_counts[0] + signal_counts[2])
+        else:
+            nonzero_signals = np.count_nonzero(sig_arr)  # NaN counts as a signal, like signals != 0
+
         # Check if there are any nonzero signals (1 or -1)
-        nonzero_signals = (signals != 0).sum()
         if len(signals) == 0 or nonzero_signals == 0:
             return {
                 'total_signals': 0,
@@ -340,61 +796,96 @@ class BacktestEngine:
                 prices = data[price_cols[0]]
             else:
                 prices = data.iloc[:, 1]  # Assume second column is price
-        
-        # Calculate returns (assume daily)
-        returns = prices.pct_change().fillna(0)
-        
-        # Calculate strategy returns
-        strategy_returns = signals.shift(1) * returns
-        
+
+        if signals.index.equals(prices.index):
+            # Calculate returns (assume daily)
+            px = prices.to_numpy(dtype=np.float64)
+            returns = np.zeros_like(px)
+            returns[1:] = px[1:] / px[:-1] - 1.0
+            returns[np.isnan(returns)] = 0.0
+
+            # Calculate strategy returns (previous bar's signal); the first bar
+            # has no prior signal, so it is NaN like a pandas shift
+            strategy_returns = np.empty_like(returns)
+            strategy_returns[0] = np.nan
+            strategy_returns[1:] = sig_arr[:-1] * returns[1:]
+        else:
+            # Rows differ (e.g. the strategy dropped warm-up bars): align on labels
+            returns = prices.pct_change().fillna(0)
+            strategy_returns = (signals.shift(1) * returns).to_numpy(dtype=np.float64)
+
+        # Compiled single-pass path
+        if self.use_numba:
+            (total_signals, win_rate, total_return, max_drawdown, sharpe_ratio,
+             cagr, ann_vol, avg_trade_duration, buy_signals, sell_signals) = _metrics_kernel(
+                sig_arr, strategy_returns)
+            return {
+                'total_signals': total_signals,
+                'win_rate': win_rate,
+                'total_return': total_return,
+                'max_drawdown': max_drawdown,
+                'sharpe_ratio': sharpe_ratio,
+                'cagr': cagr,
+                'annualized_volatility': ann_vol,
+                'avg_trade_duration': avg_trade_duration,
+                'buy_signals': int(buy_signals),
+                'sell_signals': int(sell_signals)
+            }
+
+        # NaN strategy returns are skipped like pandas reductions
+        n_days = max(len(strategy_returns), 1)
+        strategy_returns = strategy_returns[~np.isnan(strategy_returns)]
+
         # Basic metrics
-        total_signals = int(abs(signals).sum())
+        if signal_counts is not None:
+            sell_signals, buy_signals = int(signal_counts[0]), int(signal_counts[2])
+            total_signals = buy_signals + sell_signals
+        else:
+            buy_signals, sell_signals = int((sig_arr == 1).sum()), int((sig_arr == -1).sum())
+            total_signals = int(np.nansum(np.abs(sig_arr)))
         total_return = strategy_returns.sum()
         
         # Win rate
         winning_trades = (strategy_returns > 0).sum()
         win_rate = winning_trades / total_signals if total_signals > 0 else 0
         
-        # Drawdown
-        cumulative_returns = (1 + strategy_returns).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdown.min()
+        # Drawdown (the compounded curve is reused for CAGR below)
+        cumulative_returns = np.cumprod(1.0 + strategy_returns)
+        running_max = np.maximum.accumulate(cumulative_returns)
+        drawdown = cumulative_returns / running_max - 1.0
+        max_drawdown = drawdown.min() if len(drawdown) > 0 else np.nan
         
         # Annualization helpers (daily assumption ~252 days)
         trading_days = 252
         ann_factor = np.sqrt(trading_days)
+        returns_std = strategy_returns.std(ddof=1) if len(strategy_returns) > 1 else np.nan
         # Sharpe ratio (annualized)
         sharpe_ratio = 0
-        if strategy_returns.std() > 0:
-            sharpe_ratio = (strategy_returns.mean() * trading_days) / (strategy_returns.std() * ann_factor)
+        if returns_std > 0:
+            sharpe_ratio = (strategy_returns.mean() * trading_days) / (returns_std * ann_factor)
 
         # CAGR (approx from cumulative returns over period length)
-        n_days = max(len(strategy_returns), 1)
-        if n_days > 0:
-            ending = (1 + strategy_returns).prod()
-            years = max(n_days / trading_days, 1e-9)
-            cagr = ending ** (1/years) - 1
-        else:
-            cagr = 0
+        ending = cumulative_returns[-1] if len(cumulative_returns) > 0 else 1.0
+        years = max(n_days / trading_days, 1e-9)
+        cagr = ending ** (1/years) - 1
 
         # Annualized volatility
-        ann_vol = strategy_returns.std() * ann_factor if strategy_returns.std() > 0 else 0
+        ann_vol = returns_std * ann_factor if returns_std > 0 else 0
         
-        # Average trade duration
-        trade_durations = []
-        in_trade = False
-        trade_start = 0
+        # Average trade duration: a 1 enters only when flat and a -1 exits only when in a
+        # trade, so the state changes are the first signal of each run of equal signals
+        # (a leading run of -1 is ignored). Pair the alternating entries and exits.
+        signal_pos = np.flatnonzero((sig_arr == 1) | (sig_arr == -1))
+        signal_vals = sig_arr[signal_pos]
+        changes = np.empty(len(signal_vals), dtype=bool)
+        if len(signal_vals):
+            changes[0] = signal_vals[0] == 1
+            changes[1:] = signal_vals[1:] != signal_vals[:-1]
+        state_pos = signal_pos[changes]
+        exits = state_pos[1::2]
+        trade_durations = exits - state_pos[0::2][:len(exits)]
         
-        for i, signal in enumerate(signals):
-            if signal == 1 and not in_trade:  # Enter trade
-                in_trade = True
-                trade_start = i
-            elif signal == -1 and in_trade:  # Exit trade
-                trade_durations.append(i - trade_start)
-                in_trade = False
-        
-        avg_trade_duration = np.mean(trade_durations) if trade_durations else 0
+        avg_trade_duration = trade_durations.mean() if len(trade_durations) else 0
         
         return {
             'total_signals': total_signals,
@@ -405,12 +896,17 @@ class BacktestEngine:
             'cagr': cagr,
             'annualized_volatility': ann_vol,
             'avg_trade_duration': avg_trade_duration,
-            'buy_signals': int((signals == 1).sum()),
-            'sell_signals': int((signals == -1).sum())
+            'buy_signals': buy_signals,
+            'sell_signals': sell_signals
         }
     
-    def test_strategy_with_scenarios(self, strategy_class, strategy_name, params=None):
-        """Test a strategy with multiple market scenarios"""
+    def test_strategy_with_scenarios(self, strategy_class, strategy_name, params=None, max_workers=None):
+        """Test a strategy with multiple market scenarios
+
+        Scenarios are independent backtests and run in parallel: in worker
+        processes when the strategy class can be pickled, otherwise in threads.
+        Pass max_workers=1 to run them serially.
+        """
         print(f"\n🔍 Testing {strategy_name} with multiple scenarios")
         print("-" * 50)
         
@@ -423,14 +919,90 @@ class BacktestEngine:
             'Low Volatility': self.generate_test_data(1000, 100, 'uptrend', 0.01)
         }
         
-        scenario_results = {}
-        
-        for scenario_name, data in scenarios.items():
-            print(f"\n  📊 Testing scenario: {scenario_name}")
-            result = self.run_backtest(strategy_class, f"{strategy_name} - {scenario_name}", data, params)
-            scenario_results[scenario_name] = result
-        
-        return scenario_results
+        jobs = {
+            scenario_name: (strategy_class, f"{strategy_name} - {scenario_name}", data, params)
+            for scenario_name, data in scenarios.items()
+        }
+        return self._run_backtests(
+            jobs, max_workers,
+            announce=lambda scenario_name: print(f"\n  📊 Testing scenario: {scenario_name}")
+        )
+
+    def run_batch(self, strategy_class, strategy_name, data, param_grid, max_workers=None):
+        """Backtest one strategy over a list of parameter sets on the same data.
+
+        Runs are parallelized like test_strategy_with_scenarios. Returns a list
+        of result dicts in param_grid order.
+        """
+        jobs = {
+            i: (strategy_class, f"{strategy_name} - {params}", data, params)
+            for i, params in enumerate(param_grid)
+        }
+        results = self._run_backtests(jobs, max_workers)
+        return [results[i] for i in range(len(param_grid))]
+
+    def run_symbols(self, strategy_class, strategy_name, data, params=None, save_outputs=None,
+                    max_workers=None, symbol_col='symbol', on_done=None):
+        """Backtest one strategy separately on each symbol in a multi-symbol frame.
+
+        Symbols are independent runs and are parallelized like
+        test_strategy_with_scenarios. With save_outputs, each symbol writes to
+        its own subdirectory of save_outputs['output_dir']. on_done(symbol, result)
+        is called as each run finishes. Returns {symbol: result} in order of
+        first appearance.
+        """
+        jobs = {}
+        for symbol, symbol_data in data.groupby(symbol_col, sort=False):
+            symbol_outputs = None
+            if save_outputs:
+                symbol_outputs = dict(save_outputs, symbol=symbol)
+                if save_outputs.get('output_dir'):
+                    symbol_outputs['output_dir'] = os.path.join(save_outputs['output_dir'], str(symbol))
+            jobs[symbol] = (strategy_class, f"{strategy_name} - {symbol}", symbol_data, params, symbol_outputs)
+        return self._run_backtests(jobs, max_workers, on_done=on_done)
+
+    def _run_backtests(self, jobs, max_workers=None, announce=None, on_done=None):
+        """Run independent run_backtest jobs ({key: args}) and return {key: result}.
+
+        Uses worker processes when the jobs pickle, otherwise threads (the
+        compiled kernels release the GIL). max_workers=1 runs serially.
+        announce(key) is called when a job is submitted and on_done(key, result)
+        when it finishes, in completion order.
+        """
+        if max_workers is None:
+            max_workers = min(len(jobs), os.cpu_count() or 1)
+
+        results = {}
+        if max_workers <= 1:
+            for key, args in jobs.items():
+                if announce:
+                    announce(key)
+                results[key] = self.run_backtest(*args)
+                if on_done:
+                    on_done(key, results[key])
+            return results
+
+        # Classes loaded from a file path (load_strategy_from_file) can't be pickled
+        try:
+            pickle.dumps([(args[0], args[3]) for args in jobs.values()])
+            executor_cls = ProcessPoolExecutor
+        except Exception:
+            executor_cls = ThreadPoolExecutor
+
+        with executor_cls(max_workers=max_workers) as ex:
+            futures = {}
+            for key, args in jobs.items():
+                if announce:
+                    announce(key)
+                futures[key] = ex.submit(self.run_backtest, *args)
+            keys = {future: key for key, future in futures.items()}
+            for future in as_completed(keys):
+                if on_done:
+                    on_done(keys[future], future.result())
+            # Collect in submission order so reports stay stable
+            for key, future in futures.items():
+                results[key] = future.result()
+        return results
     
     def generate_report(self, strategy_name, results):
         """Generate a detailed backtest report"""
@@ -518,27 +1090,27 @@ class BacktestEngine:
           - "capitalized": Datetime, Open, High, Low, Close, Volume, StockName
         """
         if variant == "lower":
-            mapping = {
-                'Date': 'date', 'Datetime': 'date',
-                'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume',
-                'StockName': 'symbol', 'Symbol': 'symbol'
-            }
-            df = df.rename(columns={c: mapping.get(c, c) for c in df.columns})
-            if 'symbol' not in df.columns:
-                # fallback if original had lowercase already
-                if 'StockName' in df.columns:
-                    df = df.rename(columns={'StockName': 'symbol'})
-            return df
+            mapping, keys = _LOWER_MAP, _LOWER_KEYS
         elif variant == "capitalized":
-            mapping = {
-                'date': 'Datetime',
-                'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume',
-                'symbol': 'StockName'
-            }
-            df = df.rename(columns={c: mapping.get(c, c) for c in df.columns})
-            return df
+            mapping, keys = _CAPS_MAP, _CAPS_KEYS
         else:
             return df
+        # Common case once data is normalized: nothing to rename, skip the rename machinery
+        if keys.isdisjoint(df.columns):
+            return df
+        return df.rename(columns=mapping)
+
+    def _output_frames(self, signals_df, processed_data, signals):
+        """Signals frame (with a date column) and raw OHLCV frame used for exports and the portfolio run."""
+        # Keep ALL columns from signals_df (including SMA indicators, etc.)
+        if 'date' in signals_df.columns:
+            sig_df = signals_df.copy(deep=not _SHALLOW_COPY_SAFE)
+        else:
+            # Fallback if no date column in signals_df
+            sig_df = pd.DataFrame({'date': processed_data.get('date', pd.RangeIndex(len(signals))), 'Signal': signals}).reset_index(drop=True)
+        # Raw OHLCV only, no MBVC enrichment
+        data_cols = [c for c in ['date','symbol','open','high','low','close','volume'] if c in processed_data.columns]
+        return sig_df, processed_data[data_cols]
 
     def _pair_signals_into_trades(self, enriched_df: pd.DataFrame) -> pd.DataFrame:
         """Pair buy/sell signals into complete trades.
@@ -553,118 +1125,161 @@ class BacktestEngine:
         if 'Signal' not in enriched_df.columns and 'signal' in enriched_df.columns:
             enriched_df = enriched_df.rename(columns={'signal': 'Signal'})
         
-        trades = []
-        buy_price = None
-        buy_date = None
-        
-        for _, row in enriched_df.iterrows():
-            signal = row.get('Signal', 0)
-            
+        n = len(enriched_df)
+        if 'Signal' not in enriched_df.columns or 'close' not in enriched_df.columns:
+            # Without signals or prices no trade can be priced
+            return pd.DataFrame(columns=['buy_date', 'sell_date', 'buy_price', 'sell_price', 'pnl', 'pnl_pct'])
+        sig = enriched_df['Signal'].to_numpy()
+        close = enriched_df['close'].to_numpy(dtype=np.float64)
+        if 'date' in enriched_df.columns:
+            dates = enriched_df['date'].to_numpy()
+        else:
+            dates = np.full(n, None, dtype=object)
+
+        # Walk only the bars carrying a signal: a BUY (re)sets the entry bar,
+        # a SELL closes it if one is open. Each trade needs its own BUY, so the
+        # BUY count bounds the number of trades.
+        capacity = int((sig == 1).sum())
+        buy_idx = np.empty(capacity, dtype=np.intp)
+        sell_idx = np.empty(capacity, dtype=np.intp)
+        n_trades = 0
+        buy_i = -1
+        for i in np.flatnonzero(sig):
+            signal = sig[i]
             if signal == 1:  # BUY signal
-                buy_date = row.get('date')
-                buy_price = row.get('close')
-                
-            elif signal == -1 and buy_price is not None:  # SELL with active position
-                sell_date = row.get('date')
-                sell_price = row.get('close')
-                
-                if buy_price is not None and sell_price is not None:
-                    pnl = sell_price - buy_price
-                    pnl_pct = (pnl / buy_price) * 100 if buy_price != 0 else 0
-                    
-                    trades.append({
-                        'buy_date': buy_date,
-                        'sell_date': sell_date,
-                        'buy_price': round(buy_price, 2),
-                        'sell_price': round(sell_price, 2),
-                        'pnl': round(pnl, 2),
-                        'pnl_pct': round(pnl_pct, 2)
-                    })
-                    buy_price = None  # Reset after closing position
-        
-        return pd.DataFrame(trades)
+                buy_i = i
+            elif signal == -1 and buy_i >= 0:  # SELL with active position
+                buy_idx[n_trades] = buy_i
+                sell_idx[n_trades] = i
+                n_trades += 1
+                buy_i = -1  # Reset after closing position
 
-    def _simulate_portfolio_with_sizing(self, prepared_df: pd.DataFrame, signals_df: pd.DataFrame, strategy, initial_capital: float):
-        """Simulate portfolio using strategy-defined sizing with next-bar execution.
+        buy_idx = buy_idx[:n_trades]
+        sell_idx = sell_idx[:n_trades]
+        buy_price = close[buy_idx]
+        sell_price = close[sell_idx]
+        pnl = sell_price - buy_price
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = np.where(buy_price != 0, pnl / buy_price * 100, 0.0)
 
-        Assumptions:
-          - Long-only, single position at a time.
-          - Execute buys/sells on next bar's 'open' if available, else next 'close'.
-          - Ignores fees/slippage (can be added later).
+        return pd.DataFrame({
+            'buy_date': dates[buy_idx],
+            'sell_date': dates[sell_idx],
+            'buy_price': np.round(buy_price, 2),
+            'sell_price': np.round(sell_price, 2),
+            'pnl': np.round(pnl, 2),
+            'pnl_pct': np.round(pnl_pct, 2)
+        })
+
+    def _align_signals(self, prepared_df: pd.DataFrame, signals_df: pd.DataFrame) -> pd.DataFrame:
+        """Attach the strategy's own columns from signals_df to prepared_df.
+
+        Signals are generated from the prepared data, so rows normally line up
+        one-to-one and columns are assigned positionally. If the row counts or
+        dates differ, fall back to a left merge on 'date'. Columns present in
+        both frames are taken from prepared_df.
 
         Returns:
-          - trades_with_size (pd.DataFrame)
-          - portfolio_transactions_df (pd.DataFrame)
-          - equity_curve (pd.DataFrame)
-          - portfolio_metrics (dict)
+            pd.DataFrame with a fresh RangeIndex
         """
-        # Normalize Signal column in signals_df (handle both 'Signal' and 'signal')
-        if 'Signal' not in signals_df.columns and 'signal' in signals_df.columns:
-            signals_df = signals_df.rename(columns={'signal': 'Signal'})
-        
-        # Merge to align dates and price columns
-        if 'date' in signals_df.columns:
-            df = pd.merge(prepared_df.copy(), signals_df.copy(), on='date', how='left')
-        else:
-            # If signals_df lacks date, align by index
-            df = prepared_df.copy()
-            df['Signal'] = signals_df['Signal'].values
+        extra_cols = [c for c in signals_df.columns if c not in prepared_df.columns]
+        has_dates = 'date' in prepared_df.columns and 'date' in signals_df.columns
+        if len(prepared_df) == len(signals_df) and (
+                not has_dates or np.array_equal(prepared_df['date'].to_numpy(), signals_df['date'].to_numpy())):
+            df = prepared_df.reset_index(drop=True)
+            for col in extra_cols:
+                df[col] = signals_df[col].to_numpy()
+            return df
+        return pd.merge(prepared_df, signals_df[['date'] + extra_cols], on='date', how='left')
 
-        df = df.sort_values('date') if 'date' in df.columns else df
-        
-        # Normalize Signal column in merged df (handle both cases)
-        if 'Signal' not in df.columns and 'signal' in df.columns:
-            df = df.rename(columns={'signal': 'Signal'})
+    def _resolve_sizing(self, strategy):
+        """Resolve a strategy's sizing hooks once per strategy instance.
 
-        # Ensure canonical 'open'/'close' columns exist after merge (handle _x/_y cases)
-        if 'close' not in df.columns:
-            for alt in ['close_x', 'close_y']:
-                if alt in df.columns:
-                    df['close'] = df[alt]
-                    break
-        if 'open' not in df.columns:
-            for alt in ['open_x', 'open_y']:
-                if alt in df.columns:
-                    df['open'] = df[alt]
-                    break
+        Returns:
+            tuple: (sizing_fn, sizing_conf) where sizing_fn is the callable
+                   position_sizing (or None) and sizing_conf is
+                   (risk_pct, init_cap, lot_size) for the risk-based fallback, with
+                   init_cap None when the strategy defines no capital, or None if
+                   the strategy's sizing attributes are malformed
+        """
+        with self._cache_lock:
+            cached = self._sizing_cache.get(id(strategy))
+        if cached is not None and cached[0]() is strategy:
+            return cached[1]
 
-        # Compute per-row target size from strategy (can be fractional); handle method/dict name collision safely
-        target_sizes = None
         sizing_attr = getattr(strategy, 'position_sizing', None)
-        if callable(sizing_attr):
-            try:
-                target_sizes = sizing_attr(df)
-            except Exception:
-                target_sizes = None
-        if target_sizes is None:
-            # If a dict named 'position_sizing' exists (common in examples), derive simple risk-based size
-            sizing_conf = sizing_attr if isinstance(sizing_attr, dict) else getattr(strategy, 'position_sizing_config', None)
-            try:
-                risk_pct = 0.0
-                if isinstance(sizing_conf, dict):
-                    risk_pct = float(sizing_conf.get('params', {}).get('risk_pct', 0.0))
-                capital_conf = getattr(strategy, 'capital', {}) or {}
-                init_cap = float(capital_conf.get('initial_capital', initial_capital))
-                lot_size = float(getattr(strategy, 'lot_size', 1) or 1)
-                close_px = df['close'] if 'close' in df.columns else df.iloc[:, 1]
-                with np.errstate(divide='ignore', invalid='ignore'):
-                    raw_size = (risk_pct * init_cap) / (close_px * lot_size)
-                raw_size = raw_size.replace([np.inf, -np.inf], 0).fillna(0)
-                target_sizes = pd.Series(raw_size, index=df.index)
-            except Exception:
-                target_sizes = pd.Series(1, index=df.index)
+        sizing_fn = sizing_attr if callable(sizing_attr) else None
+        sizing_conf = sizing_attr if isinstance(sizing_attr, dict) else getattr(strategy, 'position_sizing_config', None)
+        try:
+            risk_pct = 0.0
+            if isinstance(sizing_conf, dict):
+                risk_pct = float(sizing_conf.get('params', {}).get('risk_pct', 0.0))
+            capital_conf = getattr(strategy, 'capital', {}) or {}
+            init_cap = capital_conf.get('initial_capital')
+            init_cap = float(init_cap) if init_cap is not None else None
+            lot_size = float(getattr(strategy, 'lot_size', 1) or 1)
+            resolved = (sizing_fn, (risk_pct, init_cap, lot_size))
+        except Exception:
+            resolved = (sizing_fn, None)
 
-        # Get entry/exit signals and execution prices from strategy methods
-        # entry_rules() and exit_rules() control both WHEN and WHICH PRICE
+        try:
+            # Keyed by id(); the weak reference guards against a recycled id
+            entry = (weakref.ref(strategy), resolved)
+        except TypeError:
+            pass  # Strategy does not support weak references; resolve every call
+        else:
+            with self._cache_lock:
+                self._sizing_cache[id(strategy)] = entry
+        return resolved
+
+    def _call_hook(self, strategy, name, fn, df):
+        """Call a strategy hook, memoized on (class, params, data) when cache_hooks is set.
+
+        The data key is a full digest of every row hash plus the column names
+        and dtypes, so any change to the frame misses. Strategies whose params
+        can't be serialized are not cached. Each caller gets its own copy of a
+        cached result, so in-place edits never reach later hits.
+        """
+        if not self.cache_hooks:
+            return fn(df)
+        try:
+            key = (
+                type(strategy), name,
+                json.dumps(getattr(strategy, 'params', None), sort_keys=True, default=repr),
+                df.shape, tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes),
+                hashlib.blake2b(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()).digest()
+            )
+        except Exception:
+            return fn(df)
+
+        # The hook itself runs outside the lock; only the cache bookkeeping is serialized
+        with self._cache_lock:
+            if key in self._hook_cache:
+                self._hook_cache.move_to_end(key)
+                return _copy_hook_result(self._hook_cache[key])
+        result = fn(df)
+        with self._cache_lock:
+            self._hook_cache[key] = _copy_hook_result(result)
+            self._hook_cache.move_to_end(key)
+            if len(self._hook_cache) > self.HOOK_CACHE_SIZE:
+                self._hook_cache.popitem(last=False)
+        return result
+
+    def _resolve_rules(self, strategy, df: pd.DataFrame) -> RuleConfig:
+        """Resolve entry/exit signals and execution price settings for a portfolio run.
+
+        Calls entry_rules()/exit_rules() when the strategy defines them (Series or
+        {'signals', 'price_col', 'shift'} dict), falling back to the Signal column.
+        """
         entry_signals = None
         exit_signals = None
         entry_config = None
         exit_config = None
-        
+
         # Get entry signals and config
         if hasattr(strategy, 'entry_rules') and callable(getattr(strategy, 'entry_rules')):
             try:
-                entry_result = strategy.entry_rules(df)
+                entry_result = self._call_hook(strategy, 'entry_rules', strategy.entry_rules, df)
                 if isinstance(entry_result, dict):
                     # Dict format: {'signals': Series, 'price_col': str, 'shift': int}
                     entry_signals = entry_result.get('signals', df.get('Signal', pd.Series(0, index=df.index)))
@@ -674,11 +1289,11 @@ class BacktestEngine:
                     entry_signals = entry_result
             except Exception:
                 pass
-        
+
         # Get exit signals and config
         if hasattr(strategy, 'exit_rules') and callable(getattr(strategy, 'exit_rules')):
             try:
-                exit_result = strategy.exit_rules(df)
+                exit_result = self._call_hook(strategy, 'exit_rules', strategy.exit_rules, df)
                 if isinstance(exit_result, dict):
                     # Dict format: {'signals': Series, 'price_col': str, 'shift': int}
                     exit_signals = exit_result.get('signals', pd.Series(0, index=df.index))
@@ -688,254 +1303,268 @@ class BacktestEngine:
                     exit_signals = exit_result
             except Exception:
                 pass
-        
+
         # Fallback to Signal column if entry_rules/exit_rules not used (backward compatible)
         if entry_signals is None:
             entry_signals = df.get('Signal', pd.Series(0, index=df.index))
         if exit_signals is None:
             # For exit, check Signal == -1 if no exit_rules provided
             exit_signals = (df.get('Signal', pd.Series(0, index=df.index)) == -1).astype(int)
-        
+
         # Ensure signals are Series with same index as df
         if not isinstance(entry_signals, pd.Series):
             entry_signals = pd.Series(entry_signals, index=df.index) if hasattr(entry_signals, '__iter__') else pd.Series(0, index=df.index)
         if not isinstance(exit_signals, pd.Series):
             exit_signals = pd.Series(exit_signals, index=df.index) if hasattr(exit_signals, '__iter__') else pd.Series(0, index=df.index)
-        
-        # Align signals with df index
-        entry_signals = entry_signals.reindex(df.index, fill_value=0)
-        exit_signals = exit_signals.reindex(df.index, fill_value=0)
-        
-        # Get execution prices from config (or defaults)
+
+        # Align signals with df index (hooks usually return it already aligned)
+        if not entry_signals.index.equals(df.index):
+            entry_signals = entry_signals.reindex(df.index, fill_value=0)
+        if not exit_signals.index.equals(df.index):
+            exit_signals = exit_signals.reindex(df.index, fill_value=0)
+
+        # Execution prices from config (or defaults)
         entry_price_col = entry_config.get('price_col', 'open') if entry_config else 'open'
         entry_shift = entry_config.get('shift', -1) if entry_config else -1
         if entry_price_col not in df.columns:
             entry_price_col = 'open' if 'open' in df.columns else 'close'
-        entry_exec_price = df[entry_price_col].shift(entry_shift) if entry_shift != 0 else df[entry_price_col]
-        
+
         exit_price_col = exit_config.get('price_col', 'open') if exit_config else 'open'
         exit_shift = exit_config.get('shift', -1) if exit_config else -1
         if exit_price_col not in df.columns:
             exit_price_col = 'open' if 'open' in df.columns else 'close'
-        exit_exec_price = df[exit_price_col].shift(exit_shift) if exit_shift != 0 else df[exit_price_col]
+
+        return RuleConfig(
+            entry_signals=entry_signals.to_numpy(dtype=np.float64),
+            exit_signals=exit_signals.to_numpy(dtype=np.float64),
+            entry_price_col=entry_price_col,
+            entry_shift=entry_shift,
+            exit_price_col=exit_price_col,
+            exit_shift=exit_shift
+        )
+
+    def _simulate_portfolio_with_sizing(self, prepared_df: pd.DataFrame, signals_df: pd.DataFrame, strategy, initial_capital: float):
+        """Simulate portfolio using strategy-defined sizing with next-bar execution.
+
+        Assumptions:
+          - Long-only, single position at a time.
+          - Execute buys/sells on next bar's 'open' if available, else next 'close'.
+          - Ignores fees/slippage (can be added later).
+
+        Returns:
+          - trades_with_size (pd.DataFrame)
+          - portfolio_transactions_df (pd.DataFrame)
+          - equity_curve (pd.DataFrame)
+          - portfolio_metrics (dict)
+        """
+        # Normalize Signal column in signals_df (handle both 'Signal' and 'signal')
+        if 'Signal' not in signals_df.columns and 'signal' in signals_df.columns:
+            signals_df = signals_df.rename(columns={'signal': 'Signal'})
+        
+        # Align dates and price columns
+        df = self._align_signals(prepared_df, signals_df)
+
+        df = df.sort_values('date') if 'date' in df.columns else df
+        
+        # Normalize Signal column in merged df (handle both cases)
+        if 'Signal' not in df.columns and 'signal' in df.columns:
+            df = df.rename(columns={'signal': 'Signal'})
+
+        # Compute per-row target size from strategy (can be fractional); handle method/dict name collision safely
+        sizing_fn, sizing_conf = self._resolve_sizing(strategy)
+        target_sizes = None
+        if sizing_fn is not None:
+            try:
+                target_sizes = self._call_hook(strategy, 'position_sizing', sizing_fn, df)
+            except Exception:
+                target_sizes = None
+        if target_sizes is None:
+            # If a dict named 'position_sizing' exists (common in examples), derive simple risk-based size
+            try:
+                risk_pct, init_cap, lot_size = sizing_conf
+                if init_cap is None:
+                    init_cap = float(initial_capital)
+                close_px = df['close'] if 'close' in df.columns else df.iloc[:, 1]
+                close_np = close_px.to_numpy(dtype=np.float64)
+                raw_size = np.empty_like(close_np)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    np.divide(risk_pct * init_cap, close_np * lot_size, out=raw_size)
+                np.nan_to_num(raw_size, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+                target_sizes = raw_size
+            except Exception:
+                target_sizes = pd.Series(1, index=df.index)
+
+        # Get entry/exit signals and execution prices from strategy methods
+        # entry_rules() and exit_rules() control both WHEN and WHICH PRICE
+        rules = self._resolve_rules(strategy, df)
+        entry_exec_price = _shift_array(df[rules.entry_price_col].to_numpy(dtype=np.float64), rules.entry_shift)
+        exit_exec_price = _shift_array(df[rules.exit_price_col].to_numpy(dtype=np.float64), rules.exit_shift)
         
         # Get execution dates (always use next bar for dates)
-        next_exec_date = df['date'].shift(-1) if 'date' in df.columns else pd.Series(index=df.index)
+        n = len(df)
+        next_date_arr = _shift_array(df['date'].to_numpy(), -1) if 'date' in df.columns else np.full(n, np.nan)
 
-        cash = float(initial_capital)
-        shares = 0
-        in_position = False
-        cost_basis = 0.0
-        entry_info = {}  # Store entry details until exit
+        if isinstance(target_sizes, pd.Series):
+            if not target_sizes.index.equals(df.index):
+                target_sizes = target_sizes.reindex(df.index, fill_value=0)
+            size_arr = target_sizes.to_numpy(dtype=np.float64)
+        else:
+            size_arr = np.asarray(target_sizes, dtype=np.float64)
+            if size_arr.shape != (n,):
+                size_arr = np.broadcast_to(size_arr, (n,)).copy()
+        close_arr = df['close'].to_numpy(dtype=np.float64) if 'close' in df.columns else np.full(n, np.nan)
+        date_arr = df['date'].to_numpy() if 'date' in df.columns else df.index.to_numpy()
 
-        trades = []
-        portfolio_transactions = []  # Detailed transaction log
-        equity_rows = []
+        simulate = _simulate_kernel if self.use_numba else getattr(_simulate_kernel, 'py_func', _simulate_kernel)
+        (cash_arr, shares_arr, equity_arr,
+         tx_bar, tx_side, tx_values, n_tx) = simulate(
+            rules.entry_signals,
+            rules.exit_signals,
+            entry_exec_price,
+            exit_exec_price,
+            size_arr,
+            close_arr,
+            'close' in df.columns,
+            float(initial_capital)
+        )
+        tx_bar = tx_bar[:n_tx]
+        tx_side = tx_side[:n_tx]
+        tx_values = tx_values[:n_tx]
+        tx_dates = next_date_arr[tx_bar]
+        is_sell = tx_side == -1
 
-        for idx, row in df.iterrows():
-            date_val = row.get('date', idx)
-            price_today_close = row.get('close', np.nan)
-            
-            # Get entry/exit signals from strategy methods (not hardcoded Signal column)
-            entry_signal = entry_signals.loc[idx] if idx in entry_signals.index else 0
-            exit_signal = exit_signals.loc[idx] if idx in exit_signals.index else 0
-
-            # Mark-to-market at today's close
-            equity_value = cash + shares * (price_today_close if not np.isnan(price_today_close) else 0.0)
-            equity_rows.append({'date': date_val, 'cash': cash, 'shares': shares, 'close': price_today_close, 'equity': equity_value})
-
-            # Entry logic: use entry_signals from entry_rules()
-            # entry_signal > 0 means enter long, < 0 means enter short
-            if entry_signal > 0 and not in_position:
-                # Determine entry execution price
-                px = entry_exec_price.loc[idx] if idx in entry_exec_price.index else np.nan
-                if np.isnan(px):
-                    continue
-                # Determine intended size at current row
-                intended_shares = int(np.floor(max(target_sizes.loc[idx], 0))) if idx in target_sizes.index else 0
-                if intended_shares <= 0:
-                    continue
-                # Constrain by available cash
-                affordable_shares = int(np.floor(cash / px))
-                qty = max(min(intended_shares, affordable_shares), 0)
-                if qty <= 0:
-                    continue
-                cost = qty * px
-                cash_before = cash
-                shares_before = shares
-                cash -= cost
-                shares += qty
-                in_position = True
-                # Store entry info for later trade completion
-                entry_info = {
-                    'entry_signal_date': date_val,
-                    'entry_date': next_exec_date.loc[idx] if idx in next_exec_date.index else date_val,
-                    'entry_price': round(px, 6),
-                    'quantity': qty,
-                    'cost': round(cost, 6)
-                }
-                # Log transaction
-                portfolio_transactions.append({
-                    'date': entry_info['entry_date'],
-                    'transaction_type': 'BUY',
-                    'price': round(px, 6),
-                    'quantity': qty,
-                    'amount': round(cost, 6),
-                    'cash_before': round(cash_before, 2),
-                    'cash_after': round(cash, 2),
-                    'shares_before': shares_before,
-                    'shares_after': shares,
-                    'equity_before': round(cash_before + shares_before * (row.get('close', px)), 2),
-                    'equity_after': round(cash + shares * (row.get('close', px)), 2)
-                })
-            # Exit logic: use exit_signals from exit_rules()
-            elif exit_signal != 0 and in_position and shares > 0:
-                # Determine exit execution price
-                px = exit_exec_price.loc[idx] if idx in exit_exec_price.index else np.nan
-                if np.isnan(px):
-                    continue
-                proceeds = shares * px
-                exit_price = round(px, 6)
-                exit_date = next_exec_date.loc[idx] if idx in next_exec_date.index else date_val
-                pnl = proceeds - (shares * entry_info['entry_price'])
-                return_pct = ((exit_price / entry_info['entry_price']) - 1.0) * 100.0
-                
-                cash_before = cash
-                shares_before = shares
-                
-                # Create complete trade row (MBVC format: single row per trade)
-                trades.append({
-                    'entry_date': entry_info['entry_date'],
-                    'entry_price': entry_info['entry_price'],
-                    'quantity': shares,
-                    'exit_date': exit_date,
-                    'exit_price': exit_price,
-                    'exit_reason': 'signal',
-                    'pnl': round(pnl, 6),
-                    'return_pct': round(return_pct, 6)
-                })
-                
-                cash += proceeds
-                shares = 0
-                in_position = False
-                entry_info = {}
-                
-                # Log transaction
-                portfolio_transactions.append({
-                    'date': exit_date,
-                    'transaction_type': 'SELL',
-                    'price': round(px, 6),
-                    'quantity': shares_before,
-                    'amount': round(proceeds, 6),
-                    'cash_before': round(cash_before, 2),
-                    'cash_after': round(cash, 2),
-                    'shares_before': shares_before,
-                    'shares_after': shares,
-                    'equity_before': round(cash_before + shares_before * (row.get('close', px)), 2),
-                    'equity_after': round(cash + shares * (row.get('close', px)), 2),
-                    'pnl': round(pnl, 6),
-                    'return_pct': round(return_pct, 6)
-                })
-
-        trades_with_size = pd.DataFrame(trades)
-        portfolio_transactions_df = pd.DataFrame(portfolio_transactions)
-        equity_curve = pd.DataFrame(equity_rows)
+        portfolio_transactions_df = pd.DataFrame({
+            'date': tx_dates,
+            'transaction_type': np.where(is_sell, 'SELL', 'BUY'),
+            'price': np.round(tx_values[:, 0], 6),
+            'quantity': tx_values[:, 1].astype(np.int64),
+            'amount': np.round(tx_values[:, 2], 6),
+            'cash_before': np.round(tx_values[:, 3], 2),
+            'cash_after': np.round(tx_values[:, 4], 2),
+            'shares_before': tx_values[:, 5].astype(np.int64),
+            'shares_after': tx_values[:, 6].astype(np.int64),
+            'equity_before': np.round(tx_values[:, 7], 2),
+            'equity_after': np.round(tx_values[:, 8], 2)
+        })
+        if is_sell.any():
+            portfolio_transactions_df['pnl'] = np.round(tx_values[:, 9], 6)
+            portfolio_transactions_df['return_pct'] = np.round(tx_values[:, 10], 6)
+
+        # Every SELL closes the BUY immediately before it (MBVC format: single row per trade)
+        sell_pos = np.flatnonzero(is_sell)
+        buy_pos = sell_pos - 1
+        trades_with_size = pd.DataFrame({
+            'entry_date': tx_dates[buy_pos],
+            'entry_price': np.round(tx_values[buy_pos, 0], 6),
+            'quantity': tx_values[sell_pos, 1].astype(np.int64),
+            'exit_date': tx_dates[sell_pos],
+            'exit_price': np.round(tx_values[sell_pos, 0], 6),
+            'exit_reason': 'signal',
+            'pnl': np.round(tx_values[sell_pos, 9], 6),
+            'return_pct': np.round(tx_values[sell_pos, 10], 6)
+        })
+        equity_curve = pd.DataFrame({
+            'date': date_arr,
+            'cash': cash_arr,
+            'shares': shares_arr,
+            'close': close_arr,
+            'equity': equity_arr
+        })
 
         # Portfolio metrics from equity curve
         portfolio_metrics = {}
         if len(equity_curve) > 1:
-            equity_curve = equity_curve.dropna(subset=['equity']).copy()
-            if not equity_curve.empty and len(equity_curve) > 1:
-                # Ensure equity is numeric and positive
-                equity_curve['equity'] = pd.to_numeric(equity_curve['equity'], errors='coerce')
-                equity_curve = equity_curve[equity_curve['equity'] > 0]
-                
-                if len(equity_curve) > 1:
-                    initial_equity = float(equity_curve['equity'].iloc[0])
-                    final_equity = float(equity_curve['equity'].iloc[-1])
-                    
-                    # Calculate returns
-                    returns = equity_curve['equity'].pct_change().fillna(0)
-                    # Remove infinite and NaN values
-                    returns = returns.replace([np.inf, -np.inf], 0).fillna(0)
-                    
-                    trading_days = 252
-                    ann_factor = np.sqrt(trading_days)
-                    
-                    # Total return
-                    total_return = (final_equity / max(initial_equity, 1e-9)) - 1
-                    
-                    # Annualized volatility (only if we have meaningful returns)
-                    vol = returns.std() * ann_factor if len(returns) > 1 and returns.std() > 0 else 0
-                    
-                    # Sharpe ratio (annualized)
-                    if vol > 0 and len(returns) > 1:
-                        mean_return = returns.mean()
-                        sharpe = (mean_return * trading_days) / vol
-                    else:
-                        sharpe = 0.0
-                    
-                    # Drawdown calculation using equity values directly (more accurate)
-                    running_max = equity_curve['equity'].expanding().max()
-                    dd = (equity_curve['equity'] - running_max) / running_max
-                    max_dd = float(dd.min()) if len(dd) > 0 else 0.0
-                    
-                    # CAGR calculation
-                    years = max(len(returns) / trading_days, 1e-9)
-                    if initial_equity > 0 and final_equity > 0:
-                        cagr = (final_equity / initial_equity) ** (1/years) - 1
-                    else:
-                        cagr = 0.0
-                    
-                    portfolio_metrics = {
-                        'total_return': float(total_return),
-                        'sharpe_ratio': float(sharpe),
-                        'max_drawdown': float(max_dd),
-                        'cagr': float(cagr),
-                        'annualized_volatility': float(vol)
-                    }
+            # Keep bars with positive equity (NaN compares False)
+            keep = equity_arr > 0
+            if not keep.all():
+                equity_curve = equity_curve.iloc[keep]
+            eq = equity_arr[keep]
+
+            if len(eq) > 1:
+                initial_equity = float(eq[0])
+                final_equity = float(eq[-1])
+
+                # Calculate returns (first bar 0, non-finite ratios zeroed)
+                returns = np.zeros_like(eq)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    returns[1:] = eq[1:] / eq[:-1] - 1.0
+                returns[~np.isfinite(returns)] = 0.0
+
+                trading_days = 252
+                ann_factor = np.sqrt(trading_days)
+
+                # Total return
+                total_return = (final_equity / max(initial_equity, 1e-9)) - 1
+
+                # Annualized volatility (only if we have meaningful returns)
+                returns_std = returns.std(ddof=1)
+                vol = returns_std * ann_factor if returns_std > 0 else 0
+
+                # Sharpe ratio (annualized)
+                if vol > 0:
+                    sharpe = (returns.mean() * trading_days) / vol
+                else:
+                    sharpe = 0.0
+
+                # Drawdown calculation using equity values directly (more accurate)
+                running_max = np.maximum.accumulate(eq)
+                max_dd = float(((eq - running_max) / running_max).min())
+
+                # CAGR calculation
+                years = max(len(returns) / trading_days, 1e-9)
+                if initial_equity > 0 and final_equity > 0:
+                    cagr = (final_equity / initial_equity) ** (1/years) - 1
+                else:
+                    cagr = 0.0
+
+                portfolio_metrics = {
+                    'total_return': float(total_return),
+                    'sharpe_ratio': float(sharpe),
+                    'max_drawdown': float(max_dd),
+                    'cagr': float(cagr),
+                    'annualized_volatility': float(vol)
+                }
 
         return trades_with_size, portfolio_transactions_df, equity_curve, portfolio_metrics
 
-    def _enrich_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _enrich_features(self, df: pd.DataFrame, copy: bool = False) -> pd.DataFrame:
         """Compute lightweight indicator features to mirror MBVC-style exports.
         Adds: rsi(14), ema20, ema50, macd_hist (12-26, sig9), vol_ratio(10),
         52w_high(252), swing_low_10d(min low 10), swing_high_10d(max high 10).
+        Columns are added to df itself unless copy=True.
         """
-        out = df.copy()
+        out = df.copy() if copy else df
         # Ensure needed cols exist
         for col in ['close','high','low','volume']:
             if col not in out.columns:
                 return out
-        # EMA
-        out['ema20'] = out['close'].ewm(span=20, adjust=False).mean()
-        out['ema50'] = out['close'].ewm(span=50, adjust=False).mean()
-        # MACD histogram
-        ema12 = out['close'].ewm(span=12, adjust=False).mean()
-        ema26 = out['close'].ewm(span=26, adjust=False).mean()
-        macd = ema12 - ema26
-        macd_sig = macd.ewm(span=9, adjust=False).mean()
-        out['macd_hist'] = macd - macd_sig
-        # RSI 14 (simple Wilder-like approximation)
-        delta = out['close'].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        roll_up = gain.ewm(alpha=1/14, adjust=False).mean()
-        roll_down = loss.ewm(alpha=1/14, adjust=False).mean()
-        rs = (roll_up / (roll_down.replace(0, 1e-12)))
-        out['rsi'] = 100 - (100 / (1 + rs))
-        # Volume ratio 10
-        out['vol_ratio'] = out['volume'] / (out['volume'].rolling(10).mean().replace(0, 1e-12))
-        # 52w high (252 trading days)
-        out['52w_high'] = out['close'].rolling(252, min_periods=1).max()
-        # Swings 10d
-        out['swing_low_10d'] = out['low'].rolling(10, min_periods=1).min()
-        out['swing_high_10d'] = out['high'].rolling(10, min_periods=1).max()
+        kernel = _features_kernel if self.use_numba else _features_vectorized
+        features = kernel(
+            out['close'].to_numpy(dtype=np.float64),
+            out['high'].to_numpy(dtype=np.float64),
+            out['low'].to_numpy(dtype=np.float64),
+            out['volume'].to_numpy(dtype=np.float64)
+        )
+        for col, values in zip(['ema20', 'ema50', 'macd_hist', 'rsi', 'vol_ratio',
+                                '52w_high', 'swing_low_10d', 'swing_high_10d'], features):
+            # Indicator precision doesn't need float64; halve the stored bytes
+            out[col] = values.astype(np.float32)
         return out
 
+# Strategy classes loaded from disk, keyed by (absolute path, mtime_ns, size, inode)
+_MODULE_CACHE = {}
+
+
 def load_strategy_from_file(file_path, strategy_name):
-    """Load a strategy class from a file"""
+    """Load a strategy class from a file (cached until the file changes)"""
     try:
+        # Nanosecond mtime, size and inode: a rewrite inside the mtime resolution, or a
+        # restore that keeps the old mtime, still changes the key
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if cache_key in _MODULE_CACHE:
+            return _MODULE_CACHE[cache_key]
+
         # Add the directory to Python path
         strategy_dir = os.path.dirname(file_path)
         if strategy_dir not in sys.path:
@@ -953,6 +1582,7 @@ def load_strategy_from_file(file_path, strategy_name):
             if (isinstance(attr, type) and 
                 hasattr(attr, 'generate_signals') and 
                 attr_name != 'Strategy'):
+                _MODULE_CACHE[cache_key] = attr
                 return attr
         
         raise ValueError(f"No strategy class found in {file_path}")
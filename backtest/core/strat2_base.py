@@ -1,5 +1,10 @@
 import pandas as pd
 import numpy as np
+try:
+    from ._fill import ffill_bfill
+except ImportError:
+    # Loaded as a top-level module with backtest/core on sys.path
+    from _fill import ffill_bfill
 
 class Strategy:
     """
@@ -87,7 +92,7 @@ class Strategy:
             pd.DataFrame: Preprocessed data.
         """
         data = data.drop_duplicates()
-        data = data.ffill().bfill()
+        data = ffill_bfill(data)
 
         if "Volume" in data.columns:
             data["Volume_norm"] = (data["Volume"] - data["Volume"].mean()) / data["Volume"].std()
@@ -95,6 +100,14 @@ class Strategy:
         if "Close" in data.columns:
             data["Returns"] = data["Close"].pct_change()
 
+        # Opt-in reduced precision: params["precision"] = "float32" stores the price
+        # columns in half the memory (after Returns, which stays float64)
+        if self.params.get("precision") == "float32":
+            price_cols = [c for c in ("Open", "High", "Low", "Close", "open", "high", "low", "close")
+                          if c in data.columns]
+            if price_cols:
+                data[price_cols] = data[price_cols].astype(np.float32)
+
         return data
 
     def data_summary(self):
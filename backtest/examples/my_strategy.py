@@ -19,6 +19,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
 
 # Import base class
 from strat2_base import Strategy
+from _rolling import rolling_mean
+from _fill import ffill_bfill
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
 
 
 class MyStrategy(Strategy):
@@ -131,13 +139,23 @@ class MyStrategy(Strategy):
                           (1=long, -1=short, 0=flat, or fractional weights).
         """
         # Calculate short and long window SMAs
-        data['SMA_short'] = data['close'].rolling(window=self.entry_rules[0]['params']['short_window']).mean()
-        data['SMA_long'] = data['close'].rolling(window=self.entry_rules[0]['params']['long_window']).mean()
-
-        # Generate signals based on SMA crossover
-        data['Signal'] = 0
-        data.loc[(data['SMA_short'] > data['SMA_long']) & (data['SMA_short'].shift(1) <= data['SMA_long'].shift(1)), 'Signal'] = 1
-        data.loc[(data['SMA_short'] < data['SMA_long']) & (data['SMA_short'].shift(1) >= data['SMA_long'].shift(1)), 'Signal'] = -1
+        close = data['close'].to_numpy(dtype=np.float64)
+        sma_short = rolling_mean(close, self.entry_rules[0]['params']['short_window'])
+        sma_long = rolling_mean(close, self.entry_rules[0]['params']['long_window'])
+        data['SMA_short'] = sma_short
+        data['SMA_long'] = sma_long
+
+        # Generate signals based on SMA crossover: sign of the spread on this bar vs the previous
+        # bar. A NaN spread compares False both ways, so warm-up bars never signal.
+        spread = sma_short - sma_long
+        cur, prev = spread[1:], spread[:-1]
+        signal = np.zeros(len(data), dtype=np.int8)
+        if NUMEXPR_AVAILABLE:
+            # One blocked, multi-threaded pass instead of a temporary array per comparison
+            signal[1:] = ne.evaluate("where((cur > 0) & (prev <= 0), 1, where((cur < 0) & (prev >= 0), -1, 0))")
+        else:
+            signal[1:] = np.where((cur > 0) & (prev <= 0), 1, np.where((cur < 0) & (prev >= 0), -1, 0))
+        data['Signal'] = signal
 
         return data
 
@@ -154,8 +172,7 @@ class MyStrategy(Strategy):
         """
         # Calculate position size based on percent risk
         risk_pct = self.position_sizing_config['params']['risk_pct']
-        position_size = (risk_pct * self.capital['initial_capital']) / (data['close'] * self.lot_size)
-        return pd.Series(position_size, index=data.index)
+        return (risk_pct * self.capital['initial_capital']) / (data['close'] * self.lot_size)
 
     def risk_management(self, data):
         """
@@ -171,8 +188,10 @@ class MyStrategy(Strategy):
         # Apply stop-loss and take-profit
         stoploss_pct = float(self.stoploss.strip('%')) / 100
         take_profit_pct = float(self.profit_target.strip('%')) / 100
-        data['StopLoss'] = data['close'] * (1 - stoploss_pct)
-        data['TakeProfit'] = data['close'] * (1 + take_profit_pct)
+        close = data['close'].to_numpy(dtype=np.float64)
+        levels = close[:, None] * np.array([1 - stoploss_pct, 1 + take_profit_pct])
+        data['StopLoss'] = levels[:, 0]
+        data['TakeProfit'] = levels[:, 1]
         return data
 
     def load_data(self):
@@ -185,7 +204,9 @@ class MyStrategy(Strategy):
         data = pd.read_csv(path)
         date_col = "Date"
         data[date_col] = pd.to_datetime(data[date_col])
-        data = data.sort_values(by=date_col)
+        # Files are usually written in date order; the O(N) check skips the sort then
+        if not data[date_col].is_monotonic_increasing:
+            data = data.sort_values(by=date_col)
         self.data = data
         return data
 
@@ -213,7 +234,7 @@ class MyStrategy(Strategy):
             pd.DataFrame: Preprocessed data.
         """
         data = data.drop_duplicates()
-        data = data.ffill().bfill()
+        data = ffill_bfill(data)
         return data
 
 # Example usage
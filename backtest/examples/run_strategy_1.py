@@ -5,6 +5,7 @@ Standalone runner for strategy_1.py (ModelAStrategy)
 
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -24,7 +25,6 @@ def main():
     # Load INFY data
     print("\n📊 Loading INFY data...")
     data_path = Path(__file__).parent.parent.parent / 'data' / '2018_1daydata' / 'INFY.parquet'
-    df = pd.read_parquet(data_path)
     
     # Normalize column names
     col_map = {
@@ -35,13 +35,25 @@ def main():
         'close': 'close',
         'volume': 'volume'
     }
-    for old, new in col_map.items():
-        if old in df.columns:
-            df[new] = df[old]
+    # Read only the OHLCV (and symbol) columns the strategy uses (column projection in the parquet reader)
+    available = pq.ParquetFile(data_path).schema_arrow.names
+    wanted = [*col_map, 'symbol']
+    df = pq.read_table(data_path, columns=[c for c in wanted if c in available]).to_pandas()
     
-    # Sort by date
-    if 'date' in df.columns:
-        df = df.sort_values('date').reset_index(drop=True)
+    # Rename reuses the existing column buffers instead of copying each one
+    df = df.rename(columns={old: new for old, new in col_map.items() if old != new and old in df.columns})
+    
+    # Prices fit comfortably in float32; halves the memory the rolling kernels stream through
+    price_cols = [c for c in ('open', 'high', 'low', 'close') if c in df.columns]
+    df[price_cols] = df[price_cols].astype(np.float32)
+    if 'volume' in df.columns and pd.api.types.is_integer_dtype(df['volume']):
+        int32 = np.iinfo(np.int32)
+        if df['volume'].between(int32.min, int32.max).all():
+            df['volume'] = df['volume'].astype(np.int32)
+    
+    # Sort by date (skipped when the file is already in date order)
+    if 'date' in df.columns and not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', ignore_index=True)
     
     # Add symbol if not present
     if 'symbol' not in df.columns:
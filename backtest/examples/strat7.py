@@ -5,6 +5,30 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
 from strat2_base import Strategy
+from _rolling import rolling_mean
+from _fill import ffill_bfill
+from _njit import njit
+
+
+@njit
+def _stop_take_profit(signal, close, stop_loss_pct, take_profit_pct):
+    """Zero the signal on the bar a stop loss or take profit (0 = off) is hit; edits signal in place."""
+    has_entry = False
+    entry_price = 0.0
+    for i in range(len(signal)):
+        if signal[i] != 0 and not has_entry:
+            has_entry = True
+            entry_price = close[i]
+        if has_entry:
+            current_price = close[i]
+            if stop_loss_pct and current_price <= entry_price * (1 - stop_loss_pct):
+                signal[i] = 0
+                has_entry = False
+            elif take_profit_pct and current_price >= entry_price * (1 + take_profit_pct):
+                signal[i] = 0
+                has_entry = False
+    return signal
+
 
 class ModelAStrategy(Strategy):
     
@@ -15,6 +39,23 @@ class ModelAStrategy(Strategy):
         self.trades = None
         self.data = None
         self.context = None
+        # Parameter-derived constants, resolved once instead of on every call
+        self._sma_fast = int(self.params.get('sma_fast', 20))
+        self._sma_slow = int(self.params.get('sma_slow', 50))
+        self._stop_loss_pct = self.params.get('stop_loss_pct')
+        self._take_profit_pct = self.params.get('take_profit_pct')
+        # window -> (close array, SMA) shared by generate_signals and exit_rules
+        self._sma_cache = {}
+        # (index, mask) for the 09:15 entry-time filter
+        self._entry_time_mask = None
+
+    def _sma(self, close, window):
+        cached = self._sma_cache.get(window)
+        if cached is not None and np.array_equal(cached[0], close, equal_nan=True):
+            return cached[1]
+        sma = rolling_mean(close, window)
+        self._sma_cache[window] = (close, sma)
+        return sma
 
     def load_data(self):
         path = self.data_config["path"]
@@ -31,7 +72,9 @@ class ModelAStrategy(Strategy):
             raise ValueError(f"Unsupported format: {format_type}")
         
         data[date_col] = pd.to_datetime(data[date_col])
-        data = data.sort_values(date_col)
+        # Files are usually written in date order; the O(N) check skips the sort then
+        if not data[date_col].is_monotonic_increasing:
+            data = data.sort_values(date_col)
         self.data = data
         return data
 
@@ -60,34 +103,56 @@ class ModelAStrategy(Strategy):
 
     def preprocess_data(self, data, context=None):
         data = data.drop_duplicates()
-        data = data.ffill().bfill()
+        data = ffill_bfill(data)
         data["returns"] = data["close"].pct_change()
         if "volume" in data.columns:
-            data["volume_norm"] = (data["volume"] - data["volume"].mean()) / data["volume"].std()
+            volume = data["volume"]
+            # z-score written into one owned buffer instead of two temporary Series
+            norm = volume.to_numpy(dtype=np.float64, copy=True)
+            np.subtract(norm, volume.mean(), out=norm)
+            np.divide(norm, volume.std(), out=norm)
+            data["volume_norm"] = norm
         return data
 
     def generate_signals(self, data, context=None):
-        sma_fast = self.params.get('sma_fast', 20)
-        sma_slow = self.params.get('sma_slow', 50)
-        data['sma_fast'] = data['close'].rolling(sma_fast).mean()
-        data['sma_slow'] = data['close'].rolling(sma_slow).mean()
-        data['signal'] = 0
-        crossover_above = (data['sma_fast'] > data['sma_slow']) & (data['sma_fast'].shift(1) <= data['sma_slow'].shift(1))
-        data.loc[crossover_above, 'signal'] = 1
-        data['signal'] = data['signal'].fillna(0)
+        close = data['close'].to_numpy(dtype=np.float64)
+        fast = self._sma(close, self._sma_fast)
+        slow = self._sma(close, self._sma_slow)
+        data['sma_fast'] = fast
+        data['sma_slow'] = slow
+        # Buy on the bar where fast closes above slow after being at or below it (NaN compares False)
+        signal = np.zeros(len(data), dtype=np.int8)
+        signal[1:] = (fast[1:] > slow[1:]) & (fast[:-1] <= slow[:-1])
+        data['signal'] = signal
         return data
 
+    def _entry_time_filter(self, index):
+        cached = self._entry_time_mask
+        if cached is not None and cached[0] is index:
+            return cached[1]
+        # Time of day as int64 timedelta arithmetic instead of an object array of datetime.time;
+        # the one-microsecond window matches time() dropping sub-microsecond precision
+        if index.tz is not None:
+            index_local = index.tz_localize(None)
+        else:
+            index_local = index
+        time_of_day = index_local - index_local.normalize()
+        start = pd.Timedelta(hours=9, minutes=15)
+        mask = np.asarray((time_of_day >= start) & (time_of_day < start + pd.Timedelta(microseconds=1)))
+        self._entry_time_mask = (index, mask)
+        return mask
+
     def entry_rules(self, data):
-        entry = data['signal'].copy()
-        time_filter = data.index.time == pd.to_datetime('09:15').time()
-        entry = entry.where(time_filter, 0)
-        return entry
+        return data['signal'].where(self._entry_time_filter(data.index), 0)
 
     def exit_rules(self, data):
-        sma_fast = data['close'].rolling(20).mean()
-        sma_slow = data['close'].rolling(50).mean()
-        exit_signal = (sma_fast < sma_slow) & (sma_fast.shift(1) >= sma_slow.shift(1))
-        return exit_signal.astype(int)
+        # Same SMAs as generate_signals on unchanged closes, so usually a cache hit
+        close = data['close'].to_numpy(dtype=np.float64)
+        sma_fast = self._sma(close, 20)
+        sma_slow = self._sma(close, 50)
+        exit_signal = np.zeros(len(data), dtype=int)
+        exit_signal[1:] = (sma_fast[1:] < sma_slow[1:]) & (sma_fast[:-1] >= sma_slow[:-1])
+        return pd.Series(exit_signal, index=data.index)
 
     def position_sizing(self, data):
         sizing_type = self.params['position_sizing']['type']
@@ -113,22 +178,16 @@ class ModelAStrategy(Strategy):
         return pd.Series(1.0, index=data.index)
 
     def risk_management(self, data):
-        stop_loss_pct = self.params.get('stop_loss_pct')
-        take_profit_pct = self.params.get('take_profit_pct')
+        stop_loss_pct = self._stop_loss_pct
+        take_profit_pct = self._take_profit_pct
         if stop_loss_pct is None and take_profit_pct is None:
             return data
-        entry_price = None
-        for i in range(len(data)):
-            if data['signal'].iloc[i] != 0 and entry_price is None:
-                entry_price = data['close'].iloc[i]
-            if entry_price is not None:
-                current_price = data['close'].iloc[i]
-                if stop_loss_pct and current_price <= entry_price * (1 - stop_loss_pct):
-                    data.loc[data.index[i], 'signal'] = 0
-                    entry_price = None
-                elif take_profit_pct and current_price >= entry_price * (1 + take_profit_pct):
-                    data.loc[data.index[i], 'signal'] = 0
-                    entry_price = None
+        data['signal'] = _stop_take_profit(
+            data['signal'].to_numpy(copy=True),
+            data['close'].to_numpy(dtype=np.float64),
+            float(stop_loss_pct or 0.0),
+            float(take_profit_pct or 0.0)
+        )
         return data
 
     def description(self):
@@ -1,5 +1,70 @@
 import pandas as pd
 import numpy as np
+import sys
+from pathlib import Path
+
+# Import base strategy class
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+from strat2_base import Strategy
+from _njit import njit
+from _rolling import rolling_max
+from _fill import ffill_bfill
+
+
+@njit
+def _breakout_hold_loop(close, breakout_signal, stop_pct, hold_period):
+    """Enter on a breakout bar, exit on stop loss or after hold_period bars.
+
+    Returns:
+        tuple: (signal, entry_price, days_held, active, stop_price) per bar
+    """
+    n = len(close)
+    signal = np.zeros(n, dtype=np.int8)
+    entry_price_out = np.full(n, np.nan)
+    days_held_out = np.zeros(n, dtype=np.int32)
+    active = np.zeros(n, dtype=np.bool_)
+    stop_price_out = np.full(n, np.nan)
+
+    current_position = False
+    entry_price = 0.0
+    days_held = 0
+    stop_price = 0.0
+
+    for i in range(n):
+        current_price = close[i]
+
+        if not current_position and breakout_signal[i]:
+            # Enter new position
+            signal[i] = 1
+            entry_price_out[i] = current_price
+            active[i] = True
+            stop_price_out[i] = current_price * (1 - stop_pct)
+
+            current_position = True
+            entry_price = current_price
+            days_held = 1
+            stop_price = entry_price * (1 - stop_pct)
+
+        elif current_position:
+            # Check exit conditions
+            stop_loss_hit = current_price <= stop_price
+            holding_period_over = days_held >= hold_period
+
+            if stop_loss_hit or holding_period_over:
+                # Exit position
+                signal[i] = -1
+                current_position = False
+                days_held = 0
+            else:
+                # Continue holding
+                active[i] = True
+                days_held_out[i] = days_held
+                entry_price_out[i] = entry_price
+                stop_price_out[i] = stop_price
+                days_held += 1
+
+    return signal, entry_price_out, days_held_out, active, stop_price_out
+
 
 class ModelAStratgy(Strategy):
     """
@@ -87,7 +152,7 @@ class ModelAStratgy(Strategy):
             pd.DataFrame: Preprocessed data.
         """
         data = data.drop_duplicates()
-        data = data.ffill().bfill()
+        data = ffill_bfill(data)
 
         if "Volume" in data.columns:
             data["Volume_norm"] = (data["Volume"] - data["Volume"].mean()) / data["Volume"].std()
@@ -267,81 +332,44 @@ class HighBreakoutHoldStrategy(Strategy):
         """
         Generate signals based on 52-week high breakout strategy.
         """
-        # Make a copy to avoid modifying original data
-        data = data.copy()
-        
-        # Filter data for backtest period
+        # Filter data for backtest period (a new frame; the caller's data is never modified)
         start_date = pd.to_datetime(self.params["start_date"])
         end_date = pd.to_datetime(self.params["end_date"])
         
         if "Date" in data.columns:
             mask = (data["Date"] >= start_date) & (data["Date"] <= end_date)
-            data = data[mask].copy()
+            data = data[mask]
         
         # Calculate 52-week high (rolling maximum of High)
         lookback = self.params["lookback_period"]
-        data['52_week_high'] = data['High'].rolling(window=lookback, min_periods=1).max()
+        high_52w = rolling_max(data['High'].to_numpy(dtype=np.float64), lookback)
+        close = data['Close'].to_numpy(dtype=np.float64)
         
-        # Initialize signal column
-        data['Signal'] = 0
-        
-        # Identify breakout signals (close above 52-week high)
-        breakout_condition = data['Close'] > data['52_week_high'].shift(1)
+        # Identify breakout signals (close above the previous bar's 52-week high)
+        breakout = np.zeros(len(data), dtype=bool)
+        breakout[1:] = close[1:] > high_52w[:-1]
         
         # Buy on next day after breakout
-        data['Breakout_Signal'] = breakout_condition.shift(1).fillna(False)
-        
-        # Initialize tracking columns for position management
-        data['Entry_Price'] = np.nan
-        data['Days_Held'] = 0
-        data['Active_Position'] = False
-        data['Stop_Price'] = np.nan
-        
-        current_position = False
-        entry_price = 0
-        days_held = 0
-        stop_price = 0
-        
-        # Iterate through data to manage positions
-        for i in range(len(data)):
-            current_price = data['Close'].iloc[i]
-            
-            if not current_position and data['Breakout_Signal'].iloc[i]:
-                # Enter new position
-                data.loc[data.index[i], 'Signal'] = 1
-                data.loc[data.index[i], 'Entry_Price'] = current_price
-                data.loc[data.index[i], 'Active_Position'] = True
-                data.loc[data.index[i], 'Stop_Price'] = current_price * (1 - self.params["stop_loss_pct"])
-                
-                current_position = True
-                entry_price = current_price
-                days_held = 1
-                stop_price = entry_price * (1 - self.params["stop_loss_pct"])
-                
-            elif current_position:
-                # Check exit conditions
-                stop_loss_hit = current_price <= stop_price
-                holding_period_over = days_held >= self.params["holding_period"]
-                
-                if stop_loss_hit or holding_period_over:
-                    # Exit position
-                    data.loc[data.index[i], 'Signal'] = -1
-                    current_position = False
-                    days_held = 0
-                else:
-                    # Continue holding
-                    data.loc[data.index[i], 'Signal'] = 0
-                    data.loc[data.index[i], 'Active_Position'] = True
-                    data.loc[data.index[i], 'Days_Held'] = days_held
-                    data.loc[data.index[i], 'Entry_Price'] = entry_price
-                    data.loc[data.index[i], 'Stop_Price'] = stop_price
-                    days_held += 1
-            else:
-                # No position
-                data.loc[data.index[i], 'Signal'] = 0
+        breakout_signal = np.zeros(len(data), dtype=bool)
+        breakout_signal[1:] = breakout[:-1]
         
-        # Fill NaN values in signal column
-        data['Signal'] = data['Signal'].fillna(0)
+        # Manage positions bar by bar over plain arrays
+        signal, entry_price, days_held, active, stop_price = _breakout_hold_loop(
+            close,
+            breakout_signal,
+            float(self.params["stop_loss_pct"]),
+            self.params["holding_period"]
+        )
+        # Add only the computed columns; on pandas 3 (copy-on-write) the existing blocks are shared
+        data = data.assign(**{
+            '52_week_high': high_52w,
+            'Signal': signal,
+            'Breakout_Signal': breakout_signal,
+            'Entry_Price': entry_price,
+            'Days_Held': days_held,
+            'Active_Position': active,
+            'Stop_Price': stop_price
+        })
         
         self.signals = data
         return data
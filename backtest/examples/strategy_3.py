@@ -1,5 +1,12 @@
 import pandas as pd
 import numpy as np
+import sys
+from pathlib import Path
+
+# Import base strategy class
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+from strat2_base import Strategy
+from _rolling import rolling_mean, rolling_mean_std
 
 class BollingerBandSMA_CrossoverStrategy(Strategy):
     """
@@ -37,20 +44,31 @@ class BollingerBandSMA_CrossoverStrategy(Strategy):
         """
         Core strategy logic: generate trading signals.
         """
-        # Calculate weekly Bollinger Band
-        data["weekly_close"] = data["Close"].resample("W").last()
-        data["weekly_bollinger_band"] = data["weekly_close"].rolling(window=self.params["bollinger_band_length"]).mean() + 2 * data["weekly_close"].rolling(window=self.params["bollinger_band_length"]).std()
+        # Calculate weekly Bollinger Band on the weekly series itself (mean and std in one
+        # pass), then carry each completed week's band forward onto the following daily bars
+        weekly_close = data["Close"].resample("W").last()
+        band_mean, band_std = rolling_mean_std(
+            weekly_close.to_numpy(dtype=np.float64), self.params["bollinger_band_length"]
+        )
+        weekly_band = pd.Series(band_mean + 2 * band_std, index=weekly_close.index)
+        upper_band = weekly_band.reindex(data.index, method="ffill").to_numpy()
+        data["weekly_bollinger_band"] = upper_band
 
         # Calculate daily SMA
-        data["daily_sma"] = data["Close"].rolling(window=self.params["sma_length"]).mean()
+        close = data["Close"].to_numpy(dtype=np.float64)
+        daily_sma = rolling_mean(close, self.params["sma_length"])
+        data["daily_sma"] = daily_sma
+
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
 
         # Generate entry signals
-        data["entry_signal"] = 0
-        data.loc[(data["Close"] > data["weekly_bollinger_band"]) & (data["Open"] > data["Close"].shift(1)), "entry_signal"] = 1
+        entry = (close > upper_band) & (data["Open"].to_numpy() > prev_close)
+        data["entry_signal"] = np.where(entry, np.int8(1), np.int8(0))
 
         # Generate exit signals
-        data["exit_signal"] = 0
-        data.loc[data["Close"] < data["daily_sma"], "exit_signal"] = -1
+        data["exit_signal"] = np.where(close < daily_sma, np.int8(-1), np.int8(0))
 
         # Combine entry and exit signals
         data["Signal"] = data["entry_signal"] - data["exit_signal"]
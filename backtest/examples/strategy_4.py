@@ -1,5 +1,12 @@
 import pandas as pd
 import numpy as np
+import sys
+from pathlib import Path
+
+# Import base strategy class
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+from strat2_base import Strategy
+from _rolling import rolling_mean, rolling_zscore
 
 class VolatilityRegimeAdaptiveMeanReversionStrategy(Strategy):
     """
@@ -57,25 +64,26 @@ class VolatilityRegimeAdaptiveMeanReversionStrategy(Strategy):
         """
         Core strategy logic: generate trading signals.
         """
-        # Calculate z-score of price deviation from 10-day SMA
-        data["SMA"] = data["Close"].rolling(window=self.params["window"]).mean()
-        data["Price_Deviation"] = data["Close"] - data["SMA"]
-        data["Z_Score"] = data["Price_Deviation"] / data["Price_Deviation"].rolling(window=self.params["window"]).std()
+        # Calculate z-score of price deviation from 10-day SMA (SMA, deviation and its rolling std in one pass)
+        sma, deviation, z_score = rolling_zscore(data["Close"].to_numpy(dtype=np.float64), self.params["window"])
+        data["SMA"] = sma
+        data["Price_Deviation"] = deviation
+        data["Z_Score"] = z_score
 
-        # Generate signals based on z-score
-        data["Signal"] = 0
-        data.loc[data["Z_Score"] < self.params["threshold_low_vol"], "Signal"] = 1
-        data.loc[data["Z_Score"] > self.params["threshold_high_vol"], "Signal"] = -1
+        # Generate signals based on z-score (the sell test is applied last, so it wins where both hold)
+        signal = np.where(z_score > self.params["threshold_high_vol"], np.int8(-1),
+                          np.where(z_score < self.params["threshold_low_vol"], np.int8(1), np.int8(0)))
+        data["Signal"] = signal
 
         # Apply holding period
-        data["Holding_Period"] = 0
-        data.loc[data["Signal"] == 1, "Holding_Period"] = self.params["holding_period_low_vol"]
-        data.loc[data["Signal"] == -1, "Holding_Period"] = self.params["holding_period_high_vol"]
+        data["Holding_Period"] = np.where(signal == 1, self.params["holding_period_low_vol"],
+                                          np.where(signal == -1, self.params["holding_period_high_vol"], 0))
 
-        # Apply exit rules
-        data["Exit_Signal"] = 0
-        data.loc[data["Z_Score"].crossing(0), "Exit_Signal"] = 1
-        data.loc[data["Holding_Period"] == 0, "Exit_Signal"] = 1
+        # Apply exit rules: z-score changes sign against the previous bar (NaN bars never cross),
+        # or no holding period applies
+        cross = np.zeros(len(z_score), dtype=bool)
+        cross[1:] = (np.signbit(z_score[1:]) != np.signbit(z_score[:-1])) & ~np.isnan(z_score[1:]) & ~np.isnan(z_score[:-1])
+        data["Exit_Signal"] = np.where(cross | (data["Holding_Period"].to_numpy() == 0), np.int8(1), np.int8(0))
 
         return data
 
@@ -83,12 +91,17 @@ class VolatilityRegimeAdaptiveMeanReversionStrategy(Strategy):
         """
         Define how much to allocate per trade.
         """
-        # Calculate ATR
-        data["High_Low"] = data["High"] - data["Low"]
-        data["High_Close"] = np.abs(data["High"] - data["Close"].shift(1))
-        data["Low_Close"] = np.abs(data["Low"] - data["Close"].shift(1))
-        data["TR"] = data[["High_Low", "High_Close", "Low_Close"]].max(axis=1)
-        data["ATR"] = data["TR"].rolling(window=self.params["ATR_window"]).mean()
+        # Calculate ATR: true range straight from the price arrays (fmax skips the NaN
+        # previous close on the first bar, like a row-wise max)
+        high = data["High"].to_numpy(dtype=np.float64)
+        low = data["Low"].to_numpy(dtype=np.float64)
+        close = data["Close"].to_numpy(dtype=np.float64)
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        data["TR"] = true_range
+        data["ATR"] = rolling_mean(true_range, self.params["ATR_window"])
 
         # Calculate position size
         data["Position_Size"] = 0
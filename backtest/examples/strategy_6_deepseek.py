@@ -6,6 +6,49 @@ from pathlib import Path
 # Import base strategy class
 sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
 from strat2_base import Strategy
+from _njit import njit
+from _rolling import rolling_max
+
+
+@njit(nogil=True)
+def _breakout_positions(close, high_52w, lookback, hold_days, stop_pct):
+    """
+    Bar-by-bar breakout position state machine over NumPy arrays.
+
+    Enters when close is above the previous bar's 52-week high and exits after
+    hold_days bars or when close falls stop_pct percent below the entry.
+    Returns (signal, hold_days, entry_price, exit_price) arrays.
+    """
+    n = len(close)
+    signal = np.zeros(n, dtype=np.int8)
+    hold = np.zeros(n, dtype=np.int32)
+    entry_out = np.full(n, np.nan)
+    exit_out = np.full(n, np.nan)
+    position_active = False
+    entry_price = 0.0
+    entry_index = 0
+    stop_level = 1 - stop_pct / 100
+    for i in range(lookback, n):
+        current_close = close[i]
+        if not position_active:
+            # Entry condition: close above previous day's 52-week high
+            if current_close > high_52w[i - 1]:
+                signal[i] = 1
+                entry_out[i] = current_close
+                position_active = True
+                entry_price = current_close
+                entry_index = i
+        else:
+            days_held = i - entry_index
+            hold[i] = days_held
+            # Exit on holding period or stop loss, otherwise carry the entry price
+            if days_held >= hold_days or current_close <= entry_price * stop_level:
+                signal[i] = -1
+                exit_out[i] = current_close
+                position_active = False
+            else:
+                entry_out[i] = entry_price
+    return signal, hold, entry_out, exit_out
 
 class HighBreakoutStrategy(Strategy):
     """
@@ -37,56 +80,23 @@ class HighBreakoutStrategy(Strategy):
         hold_days = self.params.get("hold_days", 20)
         stop_pct = self.params.get("stop_pct", 5.0)
         
-        # Initialize signals dataframe
-        signals = data.copy()
-        signals['Signal'] = 0
-        signals['52_week_high'] = signals['Close'].rolling(window=lookback).max()
-        signals['Hold_days'] = 0
-        signals['Entry_price'] = np.nan
-        signals['Exit_price'] = np.nan
-        
-        # Track position state
-        position_active = False
-        entry_price = 0
-        entry_index = 0
+        # 52-week high: O(N) sliding-window max, NaN until a full window of closes
+        close = data['Close'].to_numpy(dtype=np.float64)
+        high_52w = rolling_max(close, lookback, lookback)
         
-        for i in range(lookback, len(signals)):
-            current_close = signals['Close'].iloc[i]
-            current_52_week_high = signals['52_week_high'].iloc[i-1]  # Use previous day's 52-week high
-            
-            if not position_active:
-                # Entry condition: close above 52-week high
-                if current_close > current_52_week_high:
-                    signals.loc[signals.index[i], 'Signal'] = 1
-                    signals.loc[signals.index[i], 'Entry_price'] = current_close
-                    position_active = True
-                    entry_price = current_close
-                    entry_index = i
-                    
-            else:
-                # Calculate days held
-                days_held = i - entry_index
-                signals.loc[signals.index[i], 'Hold_days'] = days_held
-                
-                # Exit condition 1: Time-based (hold for 20 days)
-                if days_held >= hold_days:
-                    signals.loc[signals.index[i], 'Signal'] = -1
-                    signals.loc[signals.index[i], 'Exit_price'] = current_close
-                    position_active = False
-                    
-                # Exit condition 2: Stop loss (5% below entry)
-                elif current_close <= entry_price * (1 - stop_pct/100):
-                    signals.loc[signals.index[i], 'Signal'] = -1
-                    signals.loc[signals.index[i], 'Exit_price'] = current_close
-                    position_active = False
-                    
-                else:
-                    # Continue holding
-                    signals.loc[signals.index[i], 'Signal'] = 0
-                    signals.loc[signals.index[i], 'Entry_price'] = entry_price
+        # Run the stateful entry/exit pass once over plain arrays
+        signal, hold, entry, exit_ = _breakout_positions(
+            close, high_52w, int(lookback), float(hold_days), float(stop_pct)
+        )
         
-        # Ensure Signal column is properly formatted
-        signals['Signal'] = signals['Signal'].fillna(0).astype(int)
+        # Signals dataframe: input columns plus the strategy columns in one write
+        signals = data.assign(**{
+            'Signal': signal,
+            '52_week_high': high_52w,
+            'Hold_days': hold,
+            'Entry_price': entry,
+            'Exit_price': exit_
+        })
         
         self.signals = signals
         return signals
@@ -133,16 +143,11 @@ class HighBreakoutStrategy(Strategy):
         """
         data = super().preprocess_data(data, context)
         
-        # Ensure required columns are present and properly named
-        if 'close' in data.columns and 'Close' not in data.columns:
-            data['Close'] = data['close']
-        if 'open' in data.columns and 'Open' not in data.columns:
-            data['Open'] = data['open']
-        if 'high' in data.columns and 'High' not in data.columns:
-            data['High'] = data['high']
-        if 'low' in data.columns and 'Low' not in data.columns:
-            data['Low'] = data['low']
-        if 'volume' in data.columns and 'Volume' not in data.columns:
-            data['Volume'] = data['volume']
+        # Ensure required columns are present and properly named. The lowercase
+        # originals stay (the engine reads them), and the capitalized aliases share
+        # their buffers on pandas 3 (copy-on-write), added in one assign.
+        aliases = {'close': 'Close', 'open': 'Open', 'high': 'High', 'low': 'Low', 'volume': 'Volume'}
+        data = data.assign(**{new: data[old] for old, new in aliases.items()
+                              if old in data.columns and new not in data.columns})
             
         return data
\ No newline at end of file
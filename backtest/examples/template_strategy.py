@@ -10,6 +10,7 @@ Template for creating your own strategy in strat2_base format
 import pandas as pd
 import numpy as np
 from strat2_base import Strategy
+from _rolling import rolling_mean
 
 
 class YourStrategy(Strategy):
@@ -44,21 +45,12 @@ class YourStrategy(Strategy):
         """
         Optional: Clean and prepare the data for signal generation.
         """
-        # Normalize column names (handle both lowercase and capitalized)
-        if 'Close' in data.columns and 'close' not in data.columns:
-            data['close'] = data['Close']
-        if 'Open' in data.columns and 'open' not in data.columns:
-            data['open'] = data['Open']
-        if 'High' in data.columns and 'high' not in data.columns:
-            data['high'] = data['High']
-        if 'Low' in data.columns and 'low' not in data.columns:
-            data['low'] = data['Low']
-        if 'Volume' in data.columns and 'volume' not in data.columns:
-            data['volume'] = data['Volume']
-            
-        # Ensure date column exists
-        if 'date' not in data.columns and 'Date' in data.columns:
-            data['date'] = data['Date']
+        # Normalize column names (handle both lowercase and capitalized) and ensure a
+        # date column exists: one assign of aliases that share the original buffers
+        aliases = {'Close': 'close', 'Open': 'open', 'High': 'high', 'Low': 'low',
+                   'Volume': 'volume', 'Date': 'date'}
+        data = data.assign(**{new: data[old] for old, new in aliases.items()
+                              if old in data.columns and new not in data.columns})
             
         return data
     
@@ -79,19 +71,17 @@ class YourStrategy(Strategy):
         # Copy data to avoid modifying original
         data = data.copy()
         
-        # Calculate indicators (example)
-        data["indicator1"] = data["close"].rolling(window=param1).mean()
-        data["indicator2"] = data["close"].rolling(window=param2).mean()
-        
-        # Initialize signals
-        data["Signal"] = 0
-        
-        # Your trading logic here
-        # Example: Buy when indicator1 crosses above indicator2
-        data.loc[data["indicator1"] > data["indicator2"], "Signal"] = 1
+        # Calculate indicators (example): shared O(N) rolling kernels on the close array
+        close = data["close"].to_numpy(dtype=np.float64)
+        indicator1 = rolling_mean(close, param1)
+        indicator2 = rolling_mean(close, param2)
+        data["indicator1"] = indicator1
+        data["indicator2"] = indicator2
         
-        # Example: Sell when indicator1 crosses below indicator2
-        data.loc[data["indicator1"] < data["indicator2"], "Signal"] = -1
+        # Your trading logic here, as one np.where over plain arrays (int8 signals)
+        # Example: Buy when indicator1 is above indicator2, sell when it is below
+        data["Signal"] = np.where(indicator1 > indicator2, np.int8(1),
+                                  np.where(indicator1 < indicator2, np.int8(-1), np.int8(0)))
         
         return data[["Signal"]]
     
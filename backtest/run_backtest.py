@@ -42,10 +42,7 @@ def load_mbvc_sample():
         raise FileNotFoundError(f"Data file not found: {data_path}")
     
     print(f"Loading data from: {data_path}")
-    df = pd.read_parquet(data_path)
-    
-    # Combine
-    combined = df.copy()
+    combined = pd.read_parquet(data_path)
     
     # Normalize column names
     col_map = {}
@@ -68,7 +65,7 @@ def load_mbvc_sample():
     
     return combined
 
-def demo():
+def demo(all_symbols=False):
     print("="*70)
     print("🚀 LLM STRATEGY PLUG-AND-PLAY BACKTESTING DEMO")
     print("="*70)
@@ -106,30 +103,67 @@ def demo():
     if symbol_col:
         print(f"   Symbols: {market_data[symbol_col].nunique()}")
     
-    # Pick a symbol
-    symbol = 'INFY'
-    symbol_data = market_data[market_data['symbol'] == symbol].copy()
-    print(f"\n   Selected: {symbol} with {len(symbol_data)} trading days")
-    
     print("\n3️⃣ Run Backtest")
     print("-" * 70)
     
     engine = BacktestEngine(initial_capital=100000)
     
-    # Create output directory
-    output_dir = Path(__file__).parent.parent / 'output' / f'{symbol}_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+    if not all_symbols:
+        # Pick a symbol
+        symbol = 'INFY'
+        symbol_data = market_data[market_data['symbol'] == symbol]
+        print(f"   Selected: {symbol} with {len(symbol_data)} trading days")
+        
+        # Create output directory
+        output_dir = Path(__file__).parent.parent / 'output' / f'{symbol}_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        result = engine.run_backtest(
+            strategy_class=strategy_class,
+            strategy_name="ModelAStrategy",
+            data=symbol_data,
+            params=None,
+            save_outputs={'output_dir': str(output_dir), 'symbol': symbol}
+        )
+        
+        print("\n4️⃣ Results")
+        print("-" * 70)
+        _print_result(result, output_dir)
+        print("\n" + "="*70)
+        return result
+    
+    symbols = list(market_data['symbol'].unique())
+    print(f"   Selected: {len(symbols)} symbol(s): {', '.join(map(str, symbols[:10]))}")
+    
+    # Create output directory (one subdirectory per symbol)
+    output_dir = Path(__file__).parent.parent / 'output' / f'RUN_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    result = engine.run_backtest(
+    print("\n4️⃣ Results")
+    print("-" * 70)
+    done = []
+    
+    def report(symbol, result):
+        # Called in the parent as each run finishes, so every block is printed whole
+        done.append(symbol)
+        print(f"\n[{len(done)}/{len(symbols)}] {symbol}")
+        _print_result(result, output_dir / str(symbol))
+    
+    # Symbols are independent backtests; the engine spreads them over worker processes
+    results = engine.run_symbols(
         strategy_class=strategy_class,
         strategy_name="ModelAStrategy",
-        data=symbol_data.copy(),
+        data=market_data,
         params=None,
-        save_outputs={'output_dir': str(output_dir), 'symbol': symbol}
+        save_outputs={'output_dir': str(output_dir)},
+        on_done=report
     )
     
-    print("\n4️⃣ Results")
-    print("-" * 70)
+    print("\n" + "="*70)
+    
+    return results
+
+def _print_result(result, output_dir):
     if result.get('status') == 'PASSED':
         print(f"✅ Signals: {result['total_signals']}")
         print(f"📈 Win Rate: {result['win_rate']:.1%}")
@@ -138,13 +172,10 @@ def demo():
         print(f"📊 Sharpe: {result['sharpe_ratio']:.2f}")
         if 'cagr' in result:
             print(f"📅 CAGR: {result['cagr']:.1%}")
-        print(f"\n📁 Output saved to: {output_dir}")
+        print(f"📁 Output saved to: {output_dir}")
     else:
         print(f"❌ Error: {result.get('error')}")
-    
-    print("\n" + "="*70)
-    
-    return result
 
 if __name__ == "__main__":
-    demo()
+    # --all-symbols backtests every symbol in the data in parallel
+    demo(all_symbols='--all-symbols' in sys.argv[1:])
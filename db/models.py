@@ -1,41 +1,67 @@
 # db/models.py
 from dataclasses import dataclass
 from typing import Optional
-from enum import Enum
+from enum import IntEnum
 from datetime import datetime
 
-class EventType(Enum):
-    TICK = 'TICK'
-    SIGNAL = 'SIGNAL'
-    ORDER = 'ORDER'
-    ORDER_FILLED = 'ORDER_FILLED'
-    PNL_UPDATE = 'PNL_UPDATE'
-    SNAPSHOT = 'SNAPSHOT'
+# Integer codes: compare as plain ints and fit uint8 columns
+class EventType(IntEnum):
+    TICK = 0
+    SIGNAL = 1
+    ORDER = 2
+    ORDER_FILLED = 3
+    PNL_UPDATE = 4
+    SNAPSHOT = 5
 
+class Side(IntEnum):
+    BUY = 0
+    SELL = 1
+
+# Explicit __slots__ (no per-instance __dict__) rather than dataclass(slots=True),
+# which needs Python 3.10
 @dataclass
 class Event:
+    __slots__ = ('type', 'data')
     type: EventType
     data: object
 
 @dataclass
 class Signal:
+    __slots__ = ('symbol', 'signal_type', 'confidence', 'timestamp')
     symbol: str
-    signal_type: str  # 'BUY' or 'SELL'
+    signal_type: Side  # Side.BUY (0) or Side.SELL (1)
     confidence: float
     timestamp: datetime
 
+    @property
+    def signal_name(self) -> str:
+        """'BUY' or 'SELL', for display."""
+        return Side(self.signal_type).name
+
 @dataclass
 class Order:
+    __slots__ = ('symbol', 'order_type', 'quantity', 'side', 'timestamp')
     symbol: str
     order_type: str  # 'MARKET'
     quantity: int
-    side: str  # 'BUY' or 'SELL'
+    side: Side  # Side.BUY (0) or Side.SELL (1)
     timestamp: datetime
 
+    @property
+    def side_name(self) -> str:
+        """'BUY' or 'SELL', for display."""
+        return Side(self.side).name
+
 @dataclass
 class Trade:
+    __slots__ = ('symbol', 'side', 'quantity', 'price', 'timestamp')
     symbol: str
-    side: str
+    side: Side
     quantity: int
     price: float
-    timestamp: datetime
\ No newline at end of file
+    timestamp: datetime
+
+    @property
+    def side_name(self) -> str:
+        """'BUY' or 'SELL', for display."""
+        return Side(self.side).name
@@ -3,6 +3,7 @@ from .logger import get_logger
 from typing import Dict, Any, List
 from abc import ABC, abstractmethod
 import asyncio
+import logging
 import uuid
 import time
 import random
@@ -112,6 +113,29 @@ class SimulatedBroker(BaseBroker):
     It simulates order placement, cancellation, modification, and fill based on
     predefined slippage and fill chances.
     """
+    # Brokerage charged per simulated fill
+    FLAT_BROKERAGE = 20.0
+    # Column types of the get_orderbook_frame() view, one column per order field
+    _ORDERBOOK_SCHEMA = {
+        "order_id": pl.Utf8,
+        "instrument_token": pl.Utf8,
+        "transaction_type": pl.Utf8,
+        "quantity": pl.Int64,
+        "product": pl.Utf8,
+        "validity": pl.Utf8,
+        "order_type": pl.Utf8,
+        "price": pl.Float64,
+        "trigger_price": pl.Float64,
+        "disclosed_quantity": pl.Int64,
+        "is_amo": pl.Boolean,
+        "tag": pl.Utf8,
+        "status": pl.Categorical,
+        "timestamp": pl.Float64,
+        "exchange_order_id": pl.Utf8,
+        "filled_quantity": pl.Int64,
+        "filled_price": pl.Float64,
+    }
+
     def __init__(self, account_name: str, slippage_percent: float = 0.0, fill_chance: float = 1.0):
         super().__init__(account_name)
         self.broker_name = 'Simulated'
@@ -122,6 +146,12 @@ class SimulatedBroker(BaseBroker):
         self.logger = get_logger(main_folder_name="broker", broker_name="SimulatedBroker", account_name=account_name)
         self.initial_funds = 1000000.0
         self.current_funds = self.initial_funds
+        # Counter behind the sequential order and exchange order ids, behind a per-instance
+        # prefix so ids from different brokers or sessions never collide in saved history
+        self._order_seq = 0
+        self._order_prefix = uuid.uuid4().hex[:12]
+        # Whether calculate_brokerage is this class's flat fee, so place_order can skip the await
+        self._flat_brokerage = type(self).calculate_brokerage is SimulatedBroker.calculate_brokerage
         self.logger.info(f"SimulatedBroker initialized for {account_name} with {self.initial_funds} funds, slippage: {slippage_percent}%, fill chance: {fill_chance*100}%")
 
     async def initialize(self):
@@ -158,7 +188,9 @@ class SimulatedBroker(BaseBroker):
         For MARKET orders, it simulates an immediate fill.
         For LIMIT orders, it logs the order but doesn't fill immediately.
         """
-        order_id = str(uuid.uuid4())
+        # Prefixed sequential ids: unique across brokers and far cheaper than uuid4 on every order
+        self._order_seq += 1
+        order_id = f"{self._order_prefix}-O{self._order_seq:08x}"
         order_details = {
             "order_id": order_id,
             "instrument_token": instrument_token,
@@ -179,78 +211,66 @@ class SimulatedBroker(BaseBroker):
             "filled_price": 0.0
         }
         self.orders[order_id] = order_details
-        self.logger.info(f"Simulated order placed: {order_details}")
+        # Per-order lines are debug output so a fill stays off the formatting/handler path
+        log_orders = self.logger.isEnabledFor(logging.DEBUG)
+        if log_orders:
+            self.logger.debug(f"Simulated order placed: {order_details}")
 
+        kind = order_type.upper()
         # Simulate immediate fill for MARKET orders (or with a chance for LIMIT if matched)
-        if order_type.upper() == 'MARKET' and random.random() <= self.fill_chance:
-            fill_price = price if price > 0 else (random.uniform(99, 101) / 100 * order_details["price"] if order_details["price"] > 0 else 100) # Simple fill price logic
-            
+        if kind == 'MARKET' and random.random() <= self.fill_chance:
+            fill_price = price if price > 0 else 100 # Simple fill price logic
+            side = transaction_type.upper()
+            # +1 for BUY, -1 for SELL: slippage and cash flow move against the trader either way
+            sign = 1 if side == 'BUY' else -1
+
             # Apply slippage
-            slippage_amount = fill_price * (self.slippage_percent / 100)
-            if transaction_type.upper() == 'BUY':
-                fill_price += slippage_amount
-            else: # SELL
-                fill_price -= slippage_amount
+            fill_price += sign * fill_price * (self.slippage_percent / 100)
             fill_price = round(fill_price, 2)
 
-            brokerage = await self.calculate_brokerage(order_details)
-            trade_value = fill_price * quantity
-            
-            if transaction_type.upper() == 'BUY':
-                cost = trade_value + brokerage
-                if self.current_funds >= cost:
+            # The flat fee is used directly unless a subclass prices brokerage itself
+            if self._flat_brokerage:
+                brokerage = self.FLAT_BROKERAGE
+            else:
+                brokerage = await self.calculate_brokerage(order_details)
+
+            if side == 'BUY' or side == 'SELL':
+                # Cash out for a BUY (trade value plus fees), cash in for a SELL (trade value less fees)
+                cost = sign * (fill_price * quantity) + brokerage
+                if sign < 0 or self.current_funds >= cost:
                     self.current_funds -= cost
                     order_details["status"] = "FILLED"
                     order_details["filled_quantity"] = quantity
                     order_details["filled_price"] = fill_price
-                    order_details["exchange_order_id"] = str(uuid.uuid4())
-                    fill_event = {
+                    order_details["exchange_order_id"] = exchange_order_id = f"{self._order_prefix}-X{self._order_seq:08x}"
+                    self.trades.append({
                         "order_id": order_id,
                         "instrument_token": instrument_token,
-                        "exchange_order_id": order_details["exchange_order_id"],
+                        "exchange_order_id": exchange_order_id,
                         "transaction_type": transaction_type,
                         "quantity": quantity,
                         "price": fill_price,
                         "brokerage": brokerage,
                         "fill_timestamp": time.time()
-                    }
-                    self.trades.append(fill_event)
-                    self.logger.info(f"Simulated order {order_id} filled. Fill Price: {fill_price}, Brokerage: {brokerage}, Remaining Funds: {self.current_funds}")
+                    })
+                    if log_orders:
+                        self.logger.debug(f"Simulated order {order_id} filled. Fill Price: {fill_price}, Brokerage: {brokerage}, Remaining Funds: {self.current_funds}")
                 else:
                     order_details["status"] = "REJECTED"
                     self.logger.warning(f"Simulated order {order_id} rejected due to insufficient funds. Funds: {self.current_funds}, Cost: {cost}")
-            elif transaction_type.upper() == 'SELL':
-                revenue = trade_value - brokerage
-                self.current_funds += revenue
-                order_details["status"] = "FILLED"
-                order_details["filled_quantity"] = quantity
-                order_details["filled_price"] = fill_price
-                order_details["exchange_order_id"] = str(uuid.uuid4())
-                fill_event = {
-                    "order_id": order_id,
-                    "instrument_token": instrument_token,
-                    "exchange_order_id": order_details["exchange_order_id"],
-                    "transaction_type": transaction_type,
-                    "quantity": quantity,
-                    "price": fill_price,
-                    "brokerage": brokerage,
-                    "fill_timestamp": time.time()
-                }
-                self.trades.append(fill_event)
-                self.logger.info(f"Simulated order {order_id} filled. Fill Price: {fill_price}, Brokerage: {brokerage}, Remaining Funds: {self.current_funds}")
-        elif order_type.upper() == 'LIMIT':
+        elif kind == 'LIMIT':
             self.logger.info(f"Simulated LIMIT order {order_id} placed. Awaiting fill conditions.")
         else:
             order_details["status"] = "REJECTED"
             self.logger.warning(f"Simulated order {order_id} rejected (fill chance missed or unsupported order type).")
 
-
         return order_details
 
     async def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Simulates cancelling an order."""
-        if order_id in self.orders and self.orders[order_id]["status"] == "PENDING":
-            self.orders[order_id]["status"] = "CANCELLED"
+        order = self.orders.get(order_id)
+        if order is not None and order["status"] == "PENDING":
+            order["status"] = "CANCELLED"
             self.logger.info(f"Simulated order {order_id} cancelled.")
             return {"status": "success", "order_id": order_id}
         self.logger.warning(f"Simulated order {order_id} not found or not in PENDING state for cancellation.")
@@ -259,8 +279,9 @@ class SimulatedBroker(BaseBroker):
     async def modify_order(self, **kwargs) -> Dict[str, Any]:
         """Simulates modifying an order."""
         order_id = kwargs.get("order_id")
-        if order_id in self.orders and self.orders[order_id]["status"] == "PENDING":
-            self.orders[order_id].update(kwargs) 
+        order = self.orders.get(order_id)
+        if order is not None and order["status"] == "PENDING":
+            order.update(kwargs)
             self.logger.info(f"Simulated order {order_id} modified: {kwargs}")
             return {"status": "success", "order_id": order_id}
         self.logger.warning(f"Simulated order {order_id} not found or not in PENDING state for modification.")
@@ -274,6 +295,18 @@ class SimulatedBroker(BaseBroker):
         """Retrieves the simulated order book."""
         return list(self.orders.values())
 
+    async def get_orderbook_frame(self) -> pl.DataFrame:
+        """Retrieves the simulated order book as a columnar frame, one row per order.
+
+        Built on demand from the order dicts with the fixed _ORDERBOOK_SCHEMA, for
+        vectorized filters such as ``pl.col("status") == "PENDING"`` over the whole
+        book. Extra keys stored by modify_order are left out, and values that cannot
+        be cast to their column's type become null.
+        """
+        orders = self.orders.values()
+        columns = {name: [order.get(name) for order in orders] for name in self._ORDERBOOK_SCHEMA}
+        return pl.DataFrame(columns, schema=self._ORDERBOOK_SCHEMA, strict=False)
+
     async def historical_data(self, **kwargs) -> pl.DataFrame:
         """Simulated historical data fetching."""
         self.logger.info(f"Simulated historical data fetch for {kwargs.get('exchange_token')}.")
@@ -322,7 +355,7 @@ class SimulatedBroker(BaseBroker):
 
     async def calculate_brokerage(self, instrument_dict: Dict[str, Any]) -> float:
         """Simulated brokerage calculation (flat fee)."""
-        return 20.0 
+        return self.FLAT_BROKERAGE
 
     async def market_holidays(self) -> pl.DataFrame:
         """Simulated market holidays."""
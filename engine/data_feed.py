@@ -1,5 +1,5 @@
 import asyncio
-import csv
+import logging
 import os
 import datetime
 import time # You'll need to import time for time.time()
@@ -7,6 +7,7 @@ from zoneinfo import ZoneInfo # Import ZoneInfo for timezone awareness
 from .event_engine import EventEngine, MarketEvent 
 from .logger import get_logger 
 from pathlib import Path
+import polars as pl
 
 class CSVDataFeed:
     """
@@ -20,43 +21,125 @@ class CSVDataFeed:
         self.delay = delay
         self.event_engine = event_engine
         self.logger = logger
+        # MarketEvents pre-built from the CSV on the first generate_ticks() call
+        self._events = None
+        # True when the CSV has no timestamp column and fresh, stamped copies are dispatched
+        self._stamp_on_dispatch = False
         self.logger.info(f"CSVDataFeed initialized with file: {self.csv_file}, delay: {self.delay}s")
 
+    # Events handed to the EventEngine per put_many() call on a zero-delay replay
+    _DISPATCH_BATCH = 256
+    # Shortest slack (seconds) worth a timed asyncio.sleep between paced ticks
+    _MIN_SLEEP = 0.001
+    # Ticks between progress lines at INFO level
+    _PROGRESS_EVERY = 10000
+
+    @staticmethod
+    def _parse_column(values: pl.Series, dtype):
+        """Vectorized float()/int() over a column of CSV strings: (parsed values, invalid row indexes)."""
+        parsed = values.str.strip_chars().cast(dtype, strict=False)
+        # Empty fields read as null and fail like float("")/int("")
+        return parsed.to_list(), parsed.is_null().arg_true().to_list()
+
+    def _load_events(self):
+        """Parses the CSV once and builds its MarketEvents, logging each unusable row by index."""
+        # Every field kept as a string, as csv.DictReader would yield it; the numeric
+        # columns are then cast once each instead of per row
+        try:
+            frame = pl.read_csv(self.csv_file, infer_schema=False)
+        except pl.exceptions.NoDataError:
+            # A 0-byte file has no header and no rows: nothing to replay
+            return []
+        n = frame.height
+
+        if "instrument_token" in frame.columns:
+            tokens = frame["instrument_token"].fill_null("").to_list()
+        elif "symbol" in frame.columns:
+            tokens = frame["symbol"].fill_null("").to_list()
+        else:
+            tokens = [None] * n
+
+        # Only the fields a MarketEvent carries are parsed; the first failing one is reported per row
+        errors = [None] * n
+        timestamps = ltps = None
+        if "timestamp" in frame.columns:
+            timestamps, invalid = self._parse_column(frame["timestamp"], pl.Int64)
+            for i in invalid:
+                errors[i] = ValueError(f"invalid value {frame['timestamp'][i]!r} for column 'timestamp'")
+        if "last_traded_price" in frame.columns:
+            ltps, invalid = self._parse_column(frame["last_traded_price"], pl.Float64)
+            for i in invalid:
+                if errors[i] is None:
+                    errors[i] = ValueError(f"invalid value {frame['last_traded_price'][i]!r} for column 'last_traded_price'")
+        else:
+            errors = [KeyError("last_traded_price") if e is None else e for e in errors]
+
+        self._stamp_on_dispatch = timestamps is None
+        events = []
+        for i in range(n):
+            error = errors[i]
+            if isinstance(error, KeyError):
+                self.logger.error(f"Missing expected column in CSV row {i}: {frame.row(i, named=True)}. Error: {error}")
+            elif error is not None:
+                self.logger.error(f"Error parsing CSV row {i}: {frame.row(i, named=True)}. Error: {error}")
+            else:
+                # Assuming timestamp is already epoch milliseconds
+                timestamp_ms = timestamps[i] if timestamps is not None else 0
+                events.append(MarketEvent(
+                    instrument_token=tokens[i],
+                    ltp=ltps[i],
+                    timestamp=timestamp_ms / 1000.0 # Convert ms to seconds
+                ))
+        self.logger.info(f"Loaded {len(events)} of {n} CSV rows as MarketEvents from {self.csv_file}")
+        return events
+
+    @staticmethod
+    def _stamped(market_event):
+        """A fresh copy of a cached event stamped with the current time; the cache is never mutated."""
+        return MarketEvent(
+            instrument_token=market_event.instrument_token,
+            ltp=market_event.ltp,
+            timestamp=int(time.time() * 1000) / 1000.0
+        )
+
     async def generate_ticks(self):
-        """Reads the CSV file line by line and dispatches MarketEvents."""
+        """Dispatches the pre-built MarketEvents, one per delay interval."""
         self.logger.info(f"Starting to generate ticks from {self.csv_file}")
-        with open(self.csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Convert relevant fields to appropriate types
-                try:
-                    # Assuming CSV columns match expected tick data format
-                    tick_data = {
-                        "instrument_token": row.get("instrument_token", row.get("symbol")), 
-                        # Assuming timestamp is already epoch milliseconds (as a string)
-                        "timestamp": int(row["timestamp"]) if "timestamp" in row else int(time.time() * 1000), 
-                        "last_traded_price": float(row["last_traded_price"]),
-                        "volume": int(row.get("volume", 0)), # Corrected: use 'volume' column from CSV
-                        "open": float(row.get("open", 0.0)), # Changed fallback from row["price"] to 0.0
-                        "high": float(row.get("high", 0.0)), # Changed fallback
-                        "low": float(row.get("low", 0.0)),   # Changed fallback
-                        "close": float(row.get("close", 0.0)), # Changed fallback
-                        "oi": int(row.get("oi", 0)), # 'oi' might not be in mock_ticks.csv, default to 0
-                        # For bid/ask, use default 0.0 if specific bid/ask price columns are missing
-                        "bid": {"price": float(row.get("bid_price", 0.0)), "quantity": int(row.get("bid_quantity", 0))},
-                        "ask": {"price": float(row.get("ask_price", 0.0)), "quantity": int(row.get("ask_quantity", 0))},
-                        "average_price": float(row.get("average_price", 0.0)) # Changed fallback
-                    }
-                    market_event = MarketEvent(
-                        instrument_token=tick_data["instrument_token"],
-                        ltp=tick_data["last_traded_price"],
-                        timestamp=tick_data["timestamp"] / 1000.0 # Convert ms to seconds
-                    )
-                    await self.event_engine.put(market_event)
-                    self.logger.info(f"CSV processed tick for {tick_data.get('instrument_token')}: LTP={tick_data.get('last_traded_price')}")
-                except ValueError as e:
-                    self.logger.error(f"Error parsing CSV row: {row}. Error: {e}")
-                except KeyError as e:
-                    self.logger.error(f"Missing expected column in CSV row: {row}. Error: {e}")
-                await asyncio.sleep(self.delay) # Simulate delay between ticks
-        self.logger.info(f"Finished generating ticks from {self.csv_file}")
\ No newline at end of file
+        if self._events is None:
+            # Parse in a worker thread so the event loop keeps serving other coroutines
+            self._events = await asyncio.to_thread(self._load_events)
+        # Per-tick lines are debug output; progress is reported at info every _PROGRESS_EVERY ticks
+        log_ticks = self.logger.isEnabledFor(logging.DEBUG)
+        events = self._events
+        if self.delay == 0:
+            # Zero-delay replay: hand events over in batches, yielding to the loop once per batch
+            for start in range(0, len(events), self._DISPATCH_BATCH):
+                batch = events[start:start + self._DISPATCH_BATCH]
+                if self._stamp_on_dispatch:
+                    batch = [self._stamped(market_event) for market_event in batch]
+                for count, market_event in enumerate(batch, start + 1):
+                    if log_ticks:
+                        self.logger.debug(f"CSV processed tick for {market_event.instrument_token}: LTP={market_event.ltp}")
+                    if count % self._PROGRESS_EVERY == 0:
+                        self.logger.info(f"Processed {count} ticks, last LTP={market_event.ltp}")
+                await self.event_engine.put_many(batch)
+                await asyncio.sleep(0)
+        else:
+            # Pace ticks against a monotonic deadline so timer overhead doesn't accumulate;
+            # slack under the threshold only yields instead of arming a timer
+            next_due = time.monotonic()
+            for count, market_event in enumerate(events, 1):
+                if self._stamp_on_dispatch:
+                    market_event = self._stamped(market_event)
+                await self.event_engine.put(market_event)
+                if log_ticks:
+                    self.logger.debug(f"CSV processed tick for {market_event.instrument_token}: LTP={market_event.ltp}")
+                if count % self._PROGRESS_EVERY == 0:
+                    self.logger.info(f"Processed {count} ticks, last LTP={market_event.ltp}")
+                next_due += self.delay
+                slack = next_due - time.monotonic()
+                if slack > self._MIN_SLEEP:
+                    await asyncio.sleep(slack)
+                else:
+                    await asyncio.sleep(0)
+        self.logger.info(f"Finished generating {len(events)} ticks from {self.csv_file}")
@@ -128,6 +128,15 @@ class EventEngine:
         """Put a new event onto the queue."""
         await self.queue.put(event)
 
+    async def put_many(self, events):
+        """Put a batch of events onto the queue, only waiting when a bounded queue is full."""
+        queue = self.queue
+        for event in events:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                await queue.put(event)
+
     async def run(self):
         """
         Starts the engine and runs the internal loop to process events.